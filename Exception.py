@@ -1,2 +1,20 @@
 class InvalidCoordinatesException(Exception):
     pass
+
+
+class BoardTooLargeException(Exception):
+    pass
+
+
+class InvalidBoardException(Exception):
+    pass
+
+
+class UnsolvableBoardException(Exception):
+    pass
+
+
+class BudgetExceededException(Exception):
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason  # see BaseAlgorithm.stop_reason
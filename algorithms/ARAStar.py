@@ -0,0 +1,186 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from loguru import logger
+
+from Exception import BudgetExceededException
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.Heuristic import HEURISTIC_TYPE, get_heuristic
+from memory.PriorityQueue import PriorityQueue
+from memory.State import State
+
+DEFAULT_WEIGHT: float = 3.0
+DEFAULT_WEIGHT_STEP: float = 0.5
+
+
+@dataclass
+class AnytimeSolution:
+    """A solution found by an anytime search, each one shorter than the previous ones."""
+
+    n_moves: int
+    w: float  # weight of the search which found it, the solution is at most w times longer than the shortest one
+    time_ms: float  # since the search started
+    explored: int  # States expanded until then
+
+
+class ARAStar(BaseAlgorithm):
+    """
+    A class for Anytime Repairing A* (ARA*) algorithm initialised with algorithm parameters.
+
+    It runs Weighted A* (see AStar) with a high weight, which finds a solution quickly, and then lowers the weight
+    by step and repairs the search, reusing States found so far, until the weight is 1 and the solution is
+    the shortest one. Each shorter solution is added to self.solutions and passed to on_solution as soon as it's found.
+
+    When the search exceeds a budget (see BaseAlgorithm), the shortest solution found so far is returned.
+    """
+
+    def __init__(
+        self,
+        heuristic_type: HEURISTIC_TYPE,
+        w: float = DEFAULT_WEIGHT,
+        step: float = DEFAULT_WEIGHT_STEP,
+    ):
+        if w < 1 or step <= 0:
+            logger.error(f"ARA* needs w >= 1 and step > 0, got w={w}, step={step}.")
+            raise ValueError(f"ARA* needs w >= 1 and step > 0, got w={w}, step={step}.")
+        self.heuristic_type = heuristic_type
+        self.heuristic = get_heuristic(heuristic_type)
+        self.w = w
+        self.step = step
+        self.on_solution: Callable[[AnytimeSolution], None] | None = None
+        self.solutions: list[AnytimeSolution] = []
+        self.open_list: PriorityQueue[State] = PriorityQueue()
+        self.closed_list: set[int] = set()
+        self.inconsistent: dict[int, State] = {}
+        # {hash(State): State reached with the fewest moves so far}
+        self.best_states: dict[int, State] = {}
+        self.expanded_states: int = 0
+        self.max_depth: int = 0
+        self.visited_states: int = 1
+
+    @property
+    def explored_states(self) -> int:
+        """Number of expansions in all searches, a State is expanded again when a shorter path to it is found."""
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. add the starting State to open-list with f(n) = g(n) + w * h(n)
+        2. improve the path: pop States with the lowest f(n) from open-list and add them to closed-list,
+           until the lowest f(n) isn't lower than the length of the best solution (or open-list is empty);
+           a neighbor reached with fewer moves than before is added to open-list, or to inconsistent-list
+           if it has already been expanded in this search
+        3. if a shorter solution has been found -> record it
+        4. if w is 1 -> return the best solution, the shortest one
+        5. else lower w by step (not below 1), move inconsistent-list to open-list, update f(n) of all States
+           in open-list, clear closed-list and go to step 2
+
+        :param state: A starting State of the puzzle
+        :return: A list of consecutive operations conducted on an initial array to achieve a target array -- a solved puzzle.
+        If no solution has been found - return None
+        """
+        if state.is_target_state():
+            return state.get_path_to_state()
+
+        self._start_time = time.perf_counter()
+        self._best_path: str | None = None
+        self.heuristic.evaluate(state)
+        self.best_states[hash(state)] = state
+        self.open_list.push(hash(state), state, self._calculate_f(state))
+        self._start_progress()
+
+        w = self.w
+        try:
+            while True:
+                self._improve_path()
+                if self._best_path is not None:
+                    logger.info(
+                        f"w={w}: best solution {len(self._best_path)} moves, {self.expanded_states} States expanded."
+                    )
+                if w == 1 or not (self.open_list or self.inconsistent):
+                    break
+                w = self.w = max(1.0, w - self.step)
+                self._reorder_open_list()
+        except BudgetExceededException as e:
+            if self._best_path is None:
+                raise
+            logger.info(f"Search stopped - {e}, returning the best solution so far.")
+            self.stop_reason = e.reason
+            return self._best_path
+
+        if self._best_path is None:
+            logger.info("PUZZLE NOT SOLVED")
+        else:
+            logger.info(
+                f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={self._best_path}"
+            )
+        return self._best_path
+
+    def _calculate_f(self, state: State) -> int | float:
+        return state.depth + self.w * state.h_value
+
+    def _improve_path(self) -> None:
+        """Run Weighted A* with the current weight until it can't find a shorter solution."""
+        best_length = len(self._best_path) if self._best_path is not None else None
+        while self.open_list:
+            key, examined_state = self.open_list.pop()
+            # Solutions are found when they are generated, one with f(n) not lower than the best length isn't shorter
+            if (
+                best_length is not None
+                and self._calculate_f(examined_state) >= best_length
+            ):
+                self.open_list.push(
+                    key, examined_state, self._calculate_f(examined_state)
+                )
+                return
+            self.closed_list.add(key)
+            self.expanded_states += 1
+            if self.expanded_states >= self._next_progress:
+                self._checkpoint(len(self.open_list), examined_state.depth)
+
+            for neighbor in examined_state.get_neighbors():
+                self.visited_states += 1
+                neighbor_hash = hash(neighbor)
+                best = self.best_states.get(neighbor_hash)
+                if best is not None and best.depth <= neighbor.depth:
+                    continue
+                self.best_states[neighbor_hash] = neighbor
+                if self.max_depth < neighbor.depth:
+                    self.max_depth = neighbor.depth
+                if neighbor.is_target_state():
+                    self._record_solution(neighbor.get_path_to_state())
+                    best_length = len(self._best_path)
+                    continue
+                self.heuristic.evaluate(neighbor)
+                if neighbor_hash in self.closed_list:
+                    self.inconsistent[neighbor_hash] = neighbor
+                else:
+                    self.open_list.push(
+                        neighbor_hash, neighbor, self._calculate_f(neighbor)
+                    )
+
+    def _record_solution(self, path: str) -> None:
+        self._best_path = path
+        solution = AnytimeSolution(
+            n_moves=len(path),
+            w=self.w,
+            time_ms=round((time.perf_counter() - self._start_time) * 1000.0, 3),
+            explored=self.expanded_states,
+        )
+        self.solutions.append(solution)
+        logger.info(
+            f"Solution of {solution.n_moves} moves with w={solution.w} after {solution.time_ms}ms."
+        )
+        if self.on_solution is not None:
+            self.on_solution(solution)
+
+    def _reorder_open_list(self) -> None:
+        """Move inconsistent States to open-list with f(n) for the new weight and start a new search."""
+        states = [self.open_list.pop()[1] for _ in range(len(self.open_list))]
+        states.extend(self.inconsistent.values())
+        self.inconsistent.clear()
+        self.closed_list.clear()
+        for state in states:
+            self.open_list.push(hash(state), state, self._calculate_f(state))
@@ -1,19 +1,27 @@
-from typing import Literal, TypeAlias
-
 from loguru import logger
 
 from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.Heuristic import HEURISTIC_TYPE, get_heuristic
+from memory.PriorityQueue import PriorityQueue
 from memory.State import State
 
-HEURISTIC_TYPE: TypeAlias = Literal["hamm", "manh"]
-
 
 class AStar(BaseAlgorithm):
-    """A class for A* algorithm initialised with algorithm parameters."""
+    """
+    A class for A* algorithm initialised with algorithm parameters.
 
-    def __init__(self, heuristic_type: HEURISTIC_TYPE):
+    With a weight w > 1 it's Weighted A*, ordering States by f(n) = g(n) + w * h(n). It expands fewer States
+    and finds solutions at most w times longer than the shortest ones.
+    """
+
+    def __init__(self, heuristic_type: HEURISTIC_TYPE, w: float = 1.0):
+        if w < 1:
+            logger.error(f"Weight of A* can't be lower than 1, got {w}.")
+            raise ValueError(f"Weight of A* can't be lower than 1, got {w}.")
         self.heuristic_type = heuristic_type
-        self.open_list: dict[int, State] = {}
+        self.heuristic = get_heuristic(heuristic_type)
+        self.w = w
+        self.open_list: PriorityQueue[State] = PriorityQueue()
         self.closed_list: dict[int, State] = {}
         self.max_depth: int = 0
         self.visited_states: int = 1
@@ -36,7 +44,7 @@ class AStar(BaseAlgorithm):
         If no solution has been found - return None
         """
 
-    def solve(self, state: State) -> str | None:
+    def _solve(self, state: State) -> str | None:
 
         # Check if starting State is target State
         if state.is_target_state():
@@ -44,28 +52,22 @@ class AStar(BaseAlgorithm):
 
         # Add first State to open_list
         state.heuristic_value = self.calculate_f(state)
-        self.open_list[hash(state)] = state
+        self.open_list.push(hash(state), state, state.heuristic_value)
+        self._start_progress()
 
         # Loop until open_list is not empty
         while self.open_list:
-            tmp_state: State | None = None
-            tmp_key: int | None = None
-            # Search for the node(State) with the lowest value of f(n), and pop from open-list.
-            # if value f(n) is equal in multiple states, take first occurrence from left on the list
-            for item in self.open_list.items():
-                if (
-                    tmp_state is None
-                    or tmp_state.heuristic_value > item[1].heuristic_value
-                ):
-                    tmp_key = item[0]
-                    tmp_state = item[1]
-            self.open_list.pop(tmp_key)
+            # Pop the node(State) with the lowest value of f(n) from open-list.
+            # if value f(n) is equal in multiple states, the one added first is popped
+            tmp_key, tmp_state = self.open_list.pop()
 
             # Get neighbors for State
             neighbors: list[State] = tmp_state.get_neighbors()
 
             # Add tmp_state to closed_list after checking neighbors
             self.closed_list[tmp_key] = tmp_state
+            if len(self.closed_list) >= self._next_progress:
+                self._checkpoint(len(self.open_list), tmp_state.depth)
 
             # For each neighbor from list
             for neighbor in neighbors:
@@ -83,36 +85,21 @@ class AStar(BaseAlgorithm):
                 # if not on both lists then add to open list
                 else:
                     neighbor_hash = hash(neighbor)
-                    if neighbor_hash in self.open_list.keys():
+                    if neighbor_hash in self.open_list:
                         continue
-                    elif neighbor_hash in self.closed_list.keys():
+                    elif neighbor_hash in self.closed_list:
                         continue
                     else:
                         neighbor.heuristic_value = self.calculate_f(neighbor)
-                        self.open_list[neighbor_hash] = neighbor
+                        self.open_list.push(
+                            neighbor_hash, neighbor, neighbor.heuristic_value
+                        )
 
         return None
 
-    def calculate_f(self, state: State) -> int:
-        """Calculate heuristic: a sum of State's depth and cumulative disorder of its elements."""
+    def calculate_f(self, state: State) -> int | float:
+        """Calculate heuristic: a sum of State's depth and cumulative disorder of its elements (weighted by w)."""
         g = state.get_state_depth()
-        h = 0
-
-        # Iterate over a State
-        for tile in state.array.flat:
-            # Count out 0 tile and tiles which are in target positions
-            self_tile_coords: tuple[int, int] = state.find_coords(tile)
-            target_tile_coords: tuple[int, int] = state.target_state.find_coords(tile)
-            if tile != 0 and self_tile_coords != target_tile_coords:
-                # If manhattan heuristic calculate distance between tile's current coords, and it's target position
-                if self.heuristic_type == "manh":
-                    h += State.diff_coords(self_tile_coords, target_tile_coords)
-                # If Hamming metric only +1 increment when tile is not in target position
-                elif self.heuristic_type == "hamm":
-                    h += 1
-                # Other heuristics are not implemented
-                else:
-                    logger.error(f"Unsupported heuristics type: {self.heuristic_type}.")
-                    raise NotImplementedError
-
-        return g + h
+        # h(n) is updated incrementally from State's parent, see Heuristic.evaluate
+        h = self.heuristic.evaluate(state)
+        return g + h if self.w == 1 else g + self.w * h
@@ -4,11 +4,18 @@ from typing import Deque
 from loguru import logger
 
 from algorithms.BaseAlgorithm import BaseAlgorithm
+from memory.NodeTable import NodeTable
+from memory.PackedState import PackedState
 from memory.State import State
 
 
 class BFS(BaseAlgorithm):
-    """A class for Breadth First Search algorithm initialised with an algorithm parameter."""
+    """
+    A class for Breadth First Search algorithm initialised with an algorithm parameter.
+
+    Nodes are kept in a NodeTable (packed boards with indexes of their parents) rather than as States,
+    so memory per node is a few dozen bytes. Boards have to fit in 64 bits (up to 4x4).
+    """
 
     def __init__(
         self,
@@ -16,11 +23,19 @@ class BFS(BaseAlgorithm):
     ):
         self.visited_states = 1  # because we always check at least the initial state
         self.max_depth = 0
-        self.closed_list: dict[int, State] = {}  # mapping {hash(State): State}
+        # number of nodes popped from the frontier, i.e. the size of the closed list
+        self.expanded_states = 0
         self.neighbors_query_order = neighbors_quality_order
-        self.frontier: Deque[State] = deque()
+        self.nodes: NodeTable | None = None
+        self.frontier: Deque[int] = deque()  # indexes of nodes in self.nodes
+        # boards in the frontier or in the closed list, to check if a State has been seen in O(1)
+        self.seen: set[int] = set()
+
+    @property
+    def explored_states(self) -> int:
+        return self.expanded_states
 
-    def solve(self, state: State) -> str | None:
+    def _solve(self, state: State | PackedState) -> str | None:
         """
         Steps of the algorithm:
         1. check if a State is the target array, if yes return, no moves need to be taken as the initial State is the target State, else:
@@ -33,57 +48,60 @@ class BFS(BaseAlgorithm):
         :param state: An initial State of the puzzle
         :return: A list of consecutive operations conducted on an initial State to achieve a target State -- a solved puzzle.
                  If no solution has been found - return None
+        :raise BoardTooLargeException: If a board doesn't fit in 64 bits.
         """
+        if not isinstance(state, PackedState):
+            state = PackedState.from_array(state.array)
         # if initial State is the target State we don't even enter the loop
         if state.is_target_state():
             logger.info("Initial State is target State. Returning [].")
             return state.get_path_to_state()
         # else add state to open list / frontier
         else:
-            self.frontier.append(state)
-            logger.debug(f"Added initial State to the frontier:\n{str(state)}.")
+            self.nodes = NodeTable(state.shape)
+            self.frontier.append(self.nodes.add(state))
+            self.seen.add(state.board)
+            self._start_progress()
+            if self.trace:
+                logger.trace("Added initial State to the frontier:\n{}", state)
 
             # loop until open list is empty
             while self.frontier:  # empty deque evaluates to False
-                logger.debug(f"Frontier not empty, {len(self.frontier)} elements.")
-
-                # take a state out from open list in FIFO order
-                examined_state = self.frontier.popleft()
-                logger.debug(
-                    f"Popped first element from the deque:\n{str(examined_state)}"
-                )
-                # add that state to closed list
-                self.closed_list[hash(examined_state)] = examined_state
-                logger.debug(
-                    f"Added examined_state to the closed_list:\n{hash(examined_state)}: {str(examined_state)}"
-                )
+                # take a state out from open list in FIFO order, which adds it to the closed list
+                examined_index = self.frontier.popleft()
+                self.expanded_states += 1
+                examined_state = self.nodes.get_state(examined_index)
+                depth = self.nodes.get_depth(examined_index) + 1
+                if self.expanded_states >= self._next_progress:
+                    self._checkpoint(len(self.frontier), depth - 1)
 
-                logger.debug(
-                    f"State examined. Fetching neighbors:\n{examined_state.get_neighbors(self.neighbors_query_order)}"
-                )
+                neighbors = examined_state.get_neighbors(self.neighbors_query_order)
+                if self.trace:
+                    logger.trace(
+                        "Popped first element from the deque:\n{}\nNeighbors:\n{}",
+                        examined_state,
+                        neighbors,
+                    )
                 # examine all neighbors checking if they are target state
-                for neighbor in examined_state.get_neighbors(
-                    self.neighbors_query_order
-                ):
-                    logger.debug(f"Checking a neighbor:\n{str(neighbor)}")
-
+                for neighbor in neighbors:
                     self.visited_states += 1
-                    if self.max_depth < neighbor.get_state_depth():
-                        self.max_depth = neighbor.get_state_depth()
+                    if self.max_depth < depth:
+                        self.max_depth = depth
 
                     if neighbor.is_target_state():
-                        path = neighbor.get_path_to_state()
+                        path = (
+                            self.nodes.get_path(examined_index)
+                            + neighbor.get_path_to_state()
+                        )
                         logger.info(
-                            f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={neighbor.get_path_to_state()}"
+                            f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={path}"
                         )
                         return path
-                    elif (
-                        neighbor in self.frontier or hash(neighbor) in self.closed_list
-                    ):
-                        logger.debug(
-                            f"Neighbor in open or closed list: {str(neighbor)}"
-                        )
+                    elif neighbor.board in self.seen:
                         continue  # do nothing with it
 
                     else:
-                        self.frontier.append(neighbor)
+                        self.frontier.append(self.nodes.add(neighbor, examined_index))
+                        self.seen.add(neighbor.board)
+        logger.info("PUZZLE NOT SOLVED")
+        return None
@@ -1,11 +1,76 @@
+import os
+import sys
+import time
 from abc import ABC, abstractmethod
 
+from loguru import logger
+
+from Exception import BudgetExceededException
 from memory.State import State
 
+# Reasons of stopping a search before it has finished (BaseAlgorithm.stop_reason)
+NODE_LIMIT: str = "node_limit"
+MEMORY_LIMIT: str = "memory_limit"
+TIMEOUT: str = "timeout"
+
+
+def get_memory_mb() -> float | None:
+    """Return resident memory of the process in MB, or None if it can't be measured on this platform."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Without /proc only the peak is available, in bytes on macOS and in kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
 
 class BaseAlgorithm(ABC):
+    # Log every examined State at TRACE level (program.py --trace). Hot loops check this flag before logging,
+    # so when it's off no message is formatted at all.
+    trace: bool = False
+    # Number of expanded States between progress events logged at INFO level
+    progress_interval: int = 100_000
+    # Budgets of a search, None for no limit. A search which exceeds one of them stops and returns None
+    # with stop_reason set, its stats are the ones gathered so far.
+    max_nodes: int | None = None  # expanded States
+    max_memory_mb: float | None = None  # resident memory of the whole process
+    timeout_s: float | None = None
+    # Number of expanded States between checks of time and memory budgets
+    budget_check_interval: int = 1_000
+    # Reason of stopping the last search before it has finished: NODE_LIMIT, MEMORY_LIMIT or TIMEOUT
+    stop_reason: str | None = None
+
+    @property
+    def explored_states(self) -> int:
+        """Number of States explored (expanded) by the algorithm, by default the size of its closed list."""
+        return len(self.closed_list)
+
+    def solve(self, state: State) -> str | None:
+        """
+        Solve a puzzle within the budgets of the algorithm.
+
+        :param state: input puzzle to solve
+        :return: a list of operations that leads to solving the puzzle as a string of characters
+        symbolising four possible directions of moves L(EFT)|R(IGHT)|U(P)|D(OWN) i.e. "URRULDU",
+        None if there is no solution or a budget has been exceeded (see stop_reason)
+        """
+        self.stop_reason = None
+        self._solve_start = time.perf_counter()
+        try:
+            return self._solve(state)
+        except BudgetExceededException as e:
+            logger.info(f"PUZZLE NOT SOLVED - {e}")
+            self.stop_reason = e.reason
+            return None
+
     @abstractmethod
-    def solve(self, state: State) -> str:
+    def _solve(self, state: State) -> str | None:
         """
         A method implementing the algorithm, which returns a solution for a given puzzle.
 
@@ -14,3 +79,59 @@ class BaseAlgorithm(ABC):
         symbolising four possible directions of moves L(EFT)|R(IGHT)|U(P)|D(OWN) i.e. "URRULDU"
         """
         pass
+
+    def _start_progress(self) -> None:
+        """Start measuring progress of a search, call before its main loop."""
+        self._progress_start = time.perf_counter()
+        self._next_progress_event = self.progress_interval
+        self._next_progress = self._get_next_checkpoint(0)
+
+    def _get_next_checkpoint(self, explored: int) -> int:
+        """Return the number of explored States at which a progress event is due or budgets have to be checked."""
+        next_checkpoint = self._next_progress_event
+        if self.max_nodes is not None:
+            next_checkpoint = min(next_checkpoint, self.max_nodes)
+        if self.timeout_s is not None or self.max_memory_mb is not None:
+            next_checkpoint = min(
+                next_checkpoint, explored + self.budget_check_interval
+            )
+        return next_checkpoint
+
+    def _checkpoint(self, frontier_size: int, depth: int) -> None:
+        """
+        Check budgets of a search and log a progress event when it's due. Call when explored_states reaches
+        self._next_progress, so that the main loop of a search only compares two numbers.
+
+        :param frontier_size: number of States waiting to be expanded
+        :param depth: depth of the State being expanded
+        :raise BudgetExceededException: If the search has exceeded one of its budgets, solve returns None then.
+        """
+        explored = self.explored_states
+        if self.max_nodes is not None and explored >= self.max_nodes:
+            raise BudgetExceededException(
+                NODE_LIMIT, f"expanded {explored} States, limit {self.max_nodes}"
+            )
+        elapsed = time.perf_counter() - self._solve_start
+        if self.timeout_s is not None and elapsed >= self.timeout_s:
+            raise BudgetExceededException(
+                TIMEOUT, f"searched for {elapsed:.3f}s, limit {self.timeout_s}s"
+            )
+        if self.max_memory_mb is not None:
+            memory_mb = get_memory_mb()
+            if memory_mb is not None and memory_mb >= self.max_memory_mb:
+                raise BudgetExceededException(
+                    MEMORY_LIMIT,
+                    f"used {memory_mb:.0f}MB of memory, limit {self.max_memory_mb}MB",
+                )
+
+        if explored >= self._next_progress_event:
+            elapsed = time.perf_counter() - self._progress_start
+            logger.info(
+                "Progress: {} States expanded, {:.0f} nodes/s, frontier {}, depth {}",
+                explored,
+                explored / elapsed if elapsed else 0.0,
+                frontier_size,
+                depth,
+            )
+            self._next_progress_event = explored + self.progress_interval
+        self._next_progress = self._get_next_checkpoint(explored)
@@ -0,0 +1,122 @@
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from memory.State import OPPOSITE_MOVES, State
+
+
+class BidirectionalBFS(BaseAlgorithm):
+    """A class for bidirectional Breadth First Search algorithm initialised with an algorithm parameter."""
+
+    def __init__(self, neighbors_query_order: str):
+        self.visited_states = 1  # because we always check at least the initial state
+        self.max_depth = 0
+        self.closed_list: dict[int, State] = (
+            {}
+        )  # States explored searching from the initial State
+        self.backward_closed_list: dict[int, State] = {}  # ... from the target State
+        self.neighbors_query_order = neighbors_query_order
+
+    @property
+    def explored_states(self) -> int:
+        return len(self.closed_list) + len(self.backward_closed_list)
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. check if a State is the target array, if yes return, else:
+        2. start two breadth first searches, a forward one from the initial State and a backward one from the target State
+        3. expand a whole layer of the search with fewer States in its frontier
+        4. if a new neighbor has been seen by the other search, the searches meet -- after the layer is finished
+           return the shortest path through a meeting State
+        5. else add new neighbors to the next layer of the expanded search and go to step 3
+
+        Each search only has to reach about half of the solution depth, so it explores roughly 2 * b^(d/2) States
+        instead of b^d.
+
+        :param state: An initial State of the puzzle
+        :return: A list of consecutive operations conducted on an initial State to achieve a target State -- a solved puzzle.
+                 If no solution has been found - return None
+        """
+        if state.is_target_state():
+            logger.info("Initial State is target State. Returning [].")
+            return state.get_path_to_state()
+
+        target = state.target_state
+        self.visited_states += 1  # the target State starts the backward search
+
+        # {hash(State): State} of all States seen by a search, i.e. explored ones and its frontier
+        forward_seen: dict[int, State] = {hash(state): state}
+        backward_seen: dict[int, State] = {hash(target): target}
+        forward_frontier: list[State] = [state]
+        backward_frontier: list[State] = [target]
+        forward_depth, backward_depth = 0, 0
+        self._start_progress()
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, path = self._expand_layer(
+                    forward_frontier, forward_seen, backward_seen, self.closed_list
+                )
+                forward_depth += 1
+            else:
+                backward_frontier, path = self._expand_layer(
+                    backward_frontier,
+                    backward_seen,
+                    forward_seen,
+                    self.backward_closed_list,
+                    backward=True,
+                )
+                backward_depth += 1
+            self.max_depth = max(self.max_depth, forward_depth, backward_depth)
+
+            if path is not None:
+                logger.info(
+                    f"PUZZLE SOLVED - DEPTH={forward_depth}+{backward_depth}, path={path}"
+                )
+                return path
+
+        logger.info("PUZZLE NOT SOLVED")
+        return None
+
+    def _expand_layer(
+        self,
+        frontier: list[State],
+        seen: dict[int, State],
+        other_seen: dict[int, State],
+        closed_list: dict[int, State],
+        backward: bool = False,
+    ) -> tuple[list[State], str | None]:
+        """
+        Explore all States of a frontier.
+
+        :return: a tuple (<next frontier>, <the shortest path through States seen by both searches or None>)
+        """
+        next_frontier: list[State] = []
+        shortest_path: str | None = None
+        for examined_state in frontier:
+            closed_list[hash(examined_state)] = examined_state
+            if self.explored_states >= self._next_progress:
+                self._checkpoint(len(frontier), examined_state.depth)
+            for neighbor in examined_state.get_neighbors(self.neighbors_query_order):
+                self.visited_states += 1
+                neighbor_hash = hash(neighbor)
+                if neighbor_hash in other_seen:
+                    if backward:
+                        path = self._join_paths(other_seen[neighbor_hash], neighbor)
+                    else:
+                        path = self._join_paths(neighbor, other_seen[neighbor_hash])
+                    # Other meeting States in the same layer may be closer to the start of the other search
+                    if shortest_path is None or len(path) < len(shortest_path):
+                        shortest_path = path
+                elif neighbor_hash not in seen:
+                    seen[neighbor_hash] = neighbor
+                    next_frontier.append(neighbor)
+        return next_frontier, shortest_path
+
+    @staticmethod
+    def _join_paths(forward_state: State, backward_state: State) -> str:
+        """Join a path from the initial State with a path from the target State to the same State, inverting the latter."""
+        backward_path = backward_state.get_path_to_state()
+        return forward_state.get_path_to_state() + "".join(
+            OPPOSITE_MOVES[move] for move in reversed(backward_path)
+        )
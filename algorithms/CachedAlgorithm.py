@@ -0,0 +1,89 @@
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from memory.SolutionCache import CachedSolution, SolutionCache, board_key
+from memory.State import State
+from memory.Symmetry import canonicalize, transpose_moves, transpose_param
+
+# Strategies which find the shortest solutions, whatever the param, as long as it has no options
+OPTIMAL_STRATEGIES: set[str] = {"astr", "idastr"}
+
+
+class CachedAlgorithm(BaseAlgorithm):
+    """
+    An algorithm which looks solutions up in a SolutionCache before solving a puzzle and stores them after.
+
+    On a cache hit the search is skipped and stats are the ones of the search which found the solution.
+    Searches stopped by their budgets (see BaseAlgorithm.solve) aren't cached.
+
+    A board and its transposed board (see memory.Symmetry) share one cache entry keyed by the canonical board of the two,
+    with moves translated through the transposition. That's exact for params which are query orders, as the query
+    order is translated too. Other params share entries only for optimal strategies, where a solution of the
+    transposed board is just as short, although it may be a different one with different stats.
+    """
+
+    def __init__(
+        self,
+        algorithm: BaseAlgorithm,
+        strategy: str,
+        strategy_param: str,
+        cache: SolutionCache,
+    ):
+        self.algorithm = algorithm
+        self.strategy = strategy
+        self.strategy_param = strategy_param
+        self.cache = cache
+        self.cache_hit: bool = False
+        self._cached: CachedSolution | None = None
+
+    @property
+    def visited_states(self) -> int:
+        return self._cached.visited if self.cache_hit else self.algorithm.visited_states
+
+    @property
+    def explored_states(self) -> int:
+        return (
+            self._cached.explored if self.cache_hit else self.algorithm.explored_states
+        )
+
+    @property
+    def max_depth(self) -> int:
+        return self._cached.max_depth if self.cache_hit else self.algorithm.max_depth
+
+    def _get_key(self, state: State) -> tuple[str, str, bool]:
+        """Return a tuple (<board key>, <param>, <if the board has been transposed>) to look a State up with."""
+        param = transpose_param(self.strategy_param)
+        if param is None and (
+            self.strategy not in OPTIMAL_STRATEGIES or ":" in self.strategy_param
+        ):
+            return board_key(state.array), self.strategy_param, False
+        array, transposed = canonicalize(state.array)
+        if not transposed:
+            return board_key(array), self.strategy_param, False
+        return board_key(array), param or self.strategy_param, True
+
+    def _solve(self, state: State) -> str | None:
+        board, param, transposed = self._get_key(state)
+        self._cached = self.cache.get(board, self.strategy, param)
+        if self._cached is not None:
+            self.cache_hit = True
+            logger.info(f"Cache hit: {self.strategy} {param} {board}")
+            moves = self._cached.moves
+            return transpose_moves(moves) if transposed and moves else moves
+
+        moves = self.algorithm.solve(state)
+        self.stop_reason = self.algorithm.stop_reason
+        if self.stop_reason is not None:
+            return moves  # a search stopped by its budget says nothing about the board
+        self.cache.put(
+            board,
+            self.strategy,
+            param,
+            CachedSolution(
+                moves=transpose_moves(moves) if transposed and moves else moves,
+                visited=self.algorithm.visited_states,
+                explored=self.algorithm.explored_states,
+                max_depth=self.algorithm.max_depth,
+            ),
+        )
+        return moves
@@ -1,22 +1,30 @@
-import queue
-
 from loguru import logger
 
 from algorithms.BaseAlgorithm import BaseAlgorithm
 from memory.State import State
 
+DEFAULT_DEPTH_LIMIT: int = 20
+
 
 class DFS(BaseAlgorithm):
-    """A class for Depth First Search algorithm initialised with algorithm parameters."""
+    """A class for depth-limited Depth First Search algorithm initialised with algorithm parameters."""
 
-    def __init__(self, neighbors_quality_order: str):
+    def __init__(self, neighbors_quality_order: str, limit: int = DEFAULT_DEPTH_LIMIT):
         self.neighbors_quality_order = neighbors_quality_order
-        self.open_list: queue.LifoQueue[State] = queue.LifoQueue()
-        self.closed_list: dict[int, State] = {}
+        self.limit = limit  # States at this depth are checked, but not expanded
+        self.open_list: list[State] = []  # a stack
+        # {hash(State): the lowest depth the State has been expanded at}
+        self.closed_list: dict[int, int] = {}
+        self.expanded_states: int = 0
         self.max_depth: int = 0
         self.visited_states: int = 1
 
-    def solve(self, state: State) -> str | None:
+    @property
+    def explored_states(self) -> int:
+        """Number of expansions, a State reached again at a lower depth is expanded again."""
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
         """
         Steps of the algorithm:
         1. check if starting State is the target State, if yes return the path to it, else proceed
@@ -24,64 +32,69 @@ class DFS(BaseAlgorithm):
         3. get a list of possible neighbors, reverse the list
         4. iterating over neighbors steps 5 - 6, if all neighbors verified go to step 7
         5. check if neighbor is target State, if yes return path to it, else
-        6. add neighbor to open-list(frontier) (without checking existence on list)
-        7. add explored State to closed-list(explored), remove from open-list(frontier)
-        8. get next State (order like in stack LIFO) from open-list and check if it's in closed-list(explored), if not -> go to step 3
+        6. add neighbor to open-list(frontier) unless it has been expanded at its depth or lower
+        7. add explored State with its depth to closed-list(explored), remove from open-list(frontier)
+        8. get next State (order like in stack LIFO) from open-list and check if it's not in closed-list(explored)
+           at its depth or lower and its depth is less than the limit, if yes -> go to step 3
         9. if target State not found -> return None
 
+        Pruning with the depth of a State, instead of just checking if it has been expanded at all, makes sure that
+        a State first reached with a long path is searched again when it's reached with a shorter one, which leaves
+        more moves before the limit. Otherwise, solutions within the limit could be missed.
+
         :param state: A starting State of the puzzle
         :return: A list of consecutive operations conducted on an initial array to achieve a target array -- a solved puzzle.
         If no solution has been found - return None
         """
-        tmp_state: State | None = None
-
         # Check if starting State is target State
         if state.is_target_state():
             return state.get_path_to_state()
 
-        # Add the start node to open_list queue, and pop for explore
-        self.open_list.put_nowait(state)
+        # Add the start node to open_list stack, and pop for explore
+        self.open_list.append(state)
+        self._start_progress()
+
+        while self.open_list:
+            # Get State from the stack (LIFO order) and check if it's not in the closed_list at its depth or lower
+            # and its depth is less than the limit, else get next State
+            tmp_state = self.open_list.pop()
+            tmp_hash = hash(tmp_state)
+            if (
+                tmp_state.depth >= self.limit
+                or self.closed_list.get(tmp_hash, self.limit) <= tmp_state.depth
+            ):
+                continue
 
-        while not self.open_list.empty():
-            if tmp_state is None:
-                tmp_state = self.open_list.get_nowait()
+            # Add explored State to closed_list
+            self.closed_list[tmp_hash] = tmp_state.depth
+            self.expanded_states += 1
+            if self.expanded_states >= self._next_progress:
+                self._checkpoint(len(self.open_list), tmp_state.depth)
 
-            # Get a list of all neighbors for the current node and reverse order
+            # Get a list of all neighbors for the current node
             neighbors: list[State] = tmp_state.get_neighbors(
                 self.neighbors_quality_order
             )
-            neighbors.reverse()
-
-            # Add already explored State to closed_list
-            self.closed_list[hash(tmp_state)] = tmp_state
 
             # For each neighbor check if:
             for neighbor in neighbors:
                 self.visited_states += 1
-                if self.max_depth < neighbor.get_state_depth():
-                    self.max_depth = neighbor.get_state_depth()
+                if self.max_depth < neighbor.depth:
+                    self.max_depth = neighbor.depth
                 # if neighbor is target State, if true -> return
                 if neighbor.is_target_state():
-                    logger.info(
-                        f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={neighbor.get_path_to_state()}"
-                    )
-                    return neighbor.get_path_to_state()
-                # else: add to open_list without checking its existence on list
-                else:
-                    self.open_list.put_nowait(neighbor)
-
-            # Set the task on queue as done
-            self.open_list.task_done()
+                    path = neighbor.get_path_to_state()
+                    logger.info(f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={path}")
+                    return path
 
-            # Get State from queue (LIFO order) and check if it is not on closed_list and depth is less than 20
-            # if true start to explore, else get next State and check
-            while not self.open_list.empty():
-                tmp_state = self.open_list.get_nowait()
+            # Add neighbors in reversed order, so that the first one in the query order is popped first
+            # States at the limit aren't added, they would not be expanded anyway
+            for neighbor in reversed(neighbors):
                 if (
-                    hash(tmp_state) not in self.closed_list.keys()
-                    and tmp_state.get_state_depth() < 20
+                    neighbor.depth < self.limit
+                    and self.closed_list.get(hash(neighbor), self.limit)
+                    > neighbor.depth
                 ):
-                    break
-                self.open_list.task_done()
+                    self.open_list.append(neighbor)
         logger.info("PUZZLE NOT SOLVED")
         return None
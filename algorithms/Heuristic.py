@@ -0,0 +1,294 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Literal, TypeAlias
+
+from loguru import logger
+
+from memory.Board import get_goal
+from memory.PatternDatabase import PDB_DIRECTORY, PatternDatabase
+from memory.State import State
+from memory.Symmetry import is_symmetric, transpose_positions
+
+HEURISTIC_TYPE: TypeAlias = Literal["hamm", "manh", "lc", "wd", "pdb"]
+
+# {(number of lines, line length): {(counts of tiles per line and target line, line of 0 tile): walking distance}}
+_WALKING_DISTANCE_TABLES: dict[
+    tuple[int, int], dict[tuple[tuple[int, ...], int], int]
+] = {}
+# {(shape, directory): pattern databases}, shared by all PatternDatabaseHeuristic instances of a process
+_PATTERN_DATABASES: dict[tuple[tuple[int, int], Path], PatternDatabase] = {}
+
+
+class Heuristic(ABC):
+    """
+    Base class for heuristics estimating a number of moves from a State to the target State.
+
+    A value calculated for a State is stored in State.h_value, so the value for its children can be updated
+    incrementally based on the only tile which has been moved instead of iterating over the whole board.
+    """
+
+    def evaluate(self, state: State) -> int:
+        """Return h(n) for a State and store it in the State."""
+        if state.parent is not None and state.parent.h_value is not None:
+            state.h_value = self.update(state)
+        else:
+            state.h_value = self.calculate(state)
+        return state.h_value
+
+    @abstractmethod
+    def calculate(self, state: State) -> int:
+        """Calculate h(n) from scratch iterating over all tiles of a State."""
+        pass
+
+    def update(self, state: State) -> int:
+        """Calculate h(n) based on h(n) of State's parent. Defaults to calculating it from scratch."""
+        return self.calculate(state)
+
+
+class Hamming(Heuristic):
+    """Number of tiles (excluding 0) which are not in their target positions."""
+
+    def calculate(self, state: State) -> int:
+        columns = state.get_state_shape()[1]
+        goal_coords = get_goal(state.get_state_shape()).coords
+        h = 0
+        for index, tile in enumerate(state.array.flat):
+            if tile != 0 and divmod(index, columns) != goal_coords[tile]:
+                h += 1
+        return h
+
+    def update(self, state: State) -> int:
+        tile, from_coords, to_coords = state.get_moved_tile()
+        goal = get_goal(state.get_state_shape()).coords[tile]
+        return state.parent.h_value - (from_coords != goal) + (to_coords != goal)
+
+
+class Manhattan(Heuristic):
+    """Sum of distances (in moves) of all tiles (excluding 0) from their target positions."""
+
+    def calculate(self, state: State) -> int:
+        columns = state.get_state_shape()[1]
+        goal_coords = get_goal(state.get_state_shape()).coords
+        h = 0
+        for index, tile in enumerate(state.array.flat):
+            if tile != 0:
+                h += State.diff_coords(divmod(index, columns), goal_coords[tile])
+        return h
+
+    def update(self, state: State) -> int:
+        tile, from_coords, to_coords = state.get_moved_tile()
+        goal = get_goal(state.get_state_shape()).coords[tile]
+        # A tile moves by one, so the distance changes by exactly +1 or -1
+        return (
+            state.parent.h_value
+            - State.diff_coords(from_coords, goal)
+            + State.diff_coords(to_coords, goal)
+        )
+
+
+class LinearConflict(Manhattan):
+    """
+    Manhattan distance plus 2 moves for each tile which has to leave its target row (column) to let other tiles pass.
+
+    Tiles are in a linear conflict when they are in their target row (column), but in reversed order. In each line
+    all tiles except the longest sequence already in order have to step out of the line and back.
+    """
+
+    def calculate(self, state: State) -> int:
+        rows, columns = state.get_state_shape()
+        conflicts = sum(self._row_conflicts(state, row) for row in range(rows)) + sum(
+            self._column_conflicts(state, column) for column in range(columns)
+        )
+        return super().calculate(state) + 2 * conflicts
+
+    def update(self, state: State) -> int:
+        tile, from_coords, to_coords = state.get_moved_tile()
+        if from_coords[0] != to_coords[0]:
+            # A vertical move changes only the rows the tile has left and entered, tiles in its column keep their order
+            lines = [from_coords[0], to_coords[0]]
+            line_conflicts = self._row_conflicts
+        else:
+            lines = [from_coords[1], to_coords[1]]
+            line_conflicts = self._column_conflicts
+        conflicts_diff = sum(
+            line_conflicts(state, line) - line_conflicts(state.parent, line)
+            for line in lines
+        )
+        # Manhattan.update adds the change of the moved tile's distance to parent's h(n)
+        return super().update(state) + 2 * conflicts_diff
+
+    @staticmethod
+    def _line_conflicts(target_positions: list[int]) -> int:
+        """
+        Return the lowest number of tiles which have to be removed from a line, so that the rest is in target order,
+        i.e. the length of the line minus the length of the longest increasing subsequence of target positions.
+        """
+        longest: list[int] = []
+        for i, position in enumerate(target_positions):
+            longest.append(
+                1
+                + max(
+                    (longest[j] for j in range(i) if target_positions[j] < position),
+                    default=0,
+                )
+            )
+        return len(target_positions) - max(longest, default=0)
+
+    def _row_conflicts(self, state: State, row: int) -> int:
+        goal_coords = get_goal(state.get_state_shape()).coords
+        return self._line_conflicts(
+            [
+                goal_coords[tile][1]
+                for tile in state.array[row].tolist()
+                if tile != 0 and goal_coords[tile][0] == row
+            ]
+        )
+
+    def _column_conflicts(self, state: State, column: int) -> int:
+        goal_coords = get_goal(state.get_state_shape()).coords
+        return self._line_conflicts(
+            [
+                goal_coords[tile][0]
+                for tile in state.array[:, column].tolist()
+                if tile != 0 and goal_coords[tile][1] == column
+            ]
+        )
+
+
+class WalkingDistance(Heuristic):
+    """
+    Walking distance: a sum of vertical and horizontal moves needed if tiles could pass each other within a row (column).
+
+    A vertical configuration of a board is the number of tiles in each row grouped by their target row, plus the row
+    of 0 tile. The lowest number of moves between vertical configurations is precomputed once per board shape with
+    breadth first search from the target configuration. Horizontal configurations are the same for columns.
+    """
+
+    def calculate(self, state: State) -> int:
+        rows, columns = state.get_state_shape()
+        goal_coords = get_goal(state.get_state_shape()).coords
+        vertical = [0] * (rows * rows)
+        horizontal = [0] * (columns * columns)
+        blank_row, blank_column = 0, 0
+        for index, tile in enumerate(state.array.flat):
+            row, column = divmod(index, columns)
+            if tile == 0:
+                blank_row, blank_column = row, column
+            else:
+                vertical[row * rows + goal_coords[tile][0]] += 1
+                horizontal[column * columns + goal_coords[tile][1]] += 1
+        return (
+            self._get_table(rows, columns)[(tuple(vertical), blank_row)]
+            + self._get_table(columns, rows)[(tuple(horizontal), blank_column)]
+        )
+
+    @staticmethod
+    def _get_table(
+        n_lines: int, line_length: int
+    ) -> dict[tuple[tuple[int, ...], int], int]:
+        """Return (and cache) walking distances of all configurations of n_lines lines, with 0 tile in the last one."""
+        if (n_lines, line_length) not in _WALKING_DISTANCE_TABLES:
+            # counts[line * n_lines + target line] is a number of tiles in a line which belong to a target line
+            counts = [0] * (n_lines * n_lines)
+            for line in range(n_lines):
+                counts[line * n_lines + line] = line_length
+            counts[-1] -= 1  # 0 tile
+            start = (tuple(counts), n_lines - 1)
+
+            table = {start: 0}
+            frontier = deque([start])
+            while frontier:
+                configuration = frontier.popleft()
+                counts, blank_line = configuration
+                for other_line in (blank_line - 1, blank_line + 1):
+                    if not 0 <= other_line < n_lines:
+                        continue
+                    # Any tile from a neighboring line can move to the line of 0 tile, tiles of one group are alike
+                    for target_line in range(n_lines):
+                        if counts[other_line * n_lines + target_line]:
+                            new_counts = list(counts)
+                            new_counts[other_line * n_lines + target_line] -= 1
+                            new_counts[blank_line * n_lines + target_line] += 1
+                            neighbor = (tuple(new_counts), other_line)
+                            if neighbor not in table:
+                                table[neighbor] = table[configuration] + 1
+                                frontier.append(neighbor)
+            _WALKING_DISTANCE_TABLES[(n_lines, line_length)] = table
+        return _WALKING_DISTANCE_TABLES[(n_lines, line_length)]
+
+
+class PatternDatabaseHeuristic(Heuristic):
+    """
+    Sum of values from additive disjoint pattern databases, see memory.PatternDatabase.
+
+    Databases are loaded (memory-mapped) from PDB_DIRECTORY the first time a board of a given shape is evaluated
+    and are kept for the whole process, so a new heuristic for each puzzle doesn't load them again.
+    With symmetric lookups on square boards the databases are also looked up for the transposed board
+    (see memory.Symmetry), which needs the same number of moves, and the higher of both sums is used.
+    The transposed board's tiles fall into different patterns, so the same tables give better estimates.
+    """
+
+    def __init__(self, directory: Path = PDB_DIRECTORY, symmetric: bool = True):
+        self.directory = directory
+        self.symmetric = symmetric
+
+    def _get_database(self, shape: tuple[int, int]) -> PatternDatabase:
+        key = (shape, self.directory)
+        if key not in _PATTERN_DATABASES:
+            _PATTERN_DATABASES[key] = PatternDatabase(shape, self.directory)
+        return _PATTERN_DATABASES[key]
+
+    @staticmethod
+    def _get_positions(state: State) -> list[int]:
+        """Return flat positions of all tiles in a State indexed by a tile."""
+        positions = [0] * len(state.array.flat)
+        for index, tile in enumerate(state.array.flat):
+            positions[tile] = index
+        return positions
+
+    def _uses_symmetry(self, shape: tuple[int, int]) -> bool:
+        return self.symmetric and is_symmetric(shape)
+
+    def calculate(self, state: State) -> int:
+        shape = state.get_state_shape()
+        database = self._get_database(shape)
+        positions = self._get_positions(state)
+        h = database.evaluate(positions)
+        if self._uses_symmetry(shape):
+            h = max(h, database.evaluate(transpose_positions(positions, shape[0])))
+        return h
+
+    def update(self, state: State) -> int:
+        if self._uses_symmetry(state.get_state_shape()):
+            # The parent's value is a maximum of two sums, so it can't be updated for one pattern only.
+            # Positions are gathered for every State anyway, so a full calculation costs only a few more lookups.
+            return self.calculate(state)
+        database = self._get_database(state.get_state_shape())
+        tile, from_coords, _ = state.get_moved_tile()
+        if tile not in database.tile_slots:
+            # Tiles outside of patterns don't change values in the databases
+            return state.parent.h_value
+        pattern_number, _ = database.tile_slots[tile]
+        positions = self._get_positions(state)
+        new_value = database.lookup(positions, pattern_number)
+        positions[tile] = from_coords[0] * state.get_state_shape()[1] + from_coords[1]
+        old_value = database.lookup(positions, pattern_number)
+        return state.parent.h_value - old_value + new_value
+
+
+HEURISTICS: dict[str, type[Heuristic]] = {
+    "hamm": Hamming,
+    "manh": Manhattan,
+    "lc": LinearConflict,
+    "wd": WalkingDistance,
+    "pdb": PatternDatabaseHeuristic,
+}
+
+
+def get_heuristic(heuristic_type: HEURISTIC_TYPE) -> Heuristic:
+    """Create a heuristic of a given type."""
+    if heuristic_type not in HEURISTICS:
+        logger.error(f"Unsupported heuristics type: {heuristic_type}.")
+        raise NotImplementedError
+    return HEURISTICS[heuristic_type]()
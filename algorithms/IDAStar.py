@@ -0,0 +1,95 @@
+import math
+
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.Heuristic import HEURISTIC_TYPE, get_heuristic
+from memory.State import OPPOSITE_MOVES, State
+
+FOUND: int = -1
+
+
+class IDAStar(BaseAlgorithm):
+    """A class for Iterative Deepening A* algorithm initialised with algorithm parameters."""
+
+    def __init__(
+        self, heuristic_type: HEURISTIC_TYPE, neighbors_query_order: str = "LRUD"
+    ):
+        self.heuristic_type = heuristic_type
+        self.heuristic = get_heuristic(heuristic_type)
+        self.neighbors_query_order = neighbors_query_order
+        self.solution: State | None = None
+        self.expanded_states: int = 0
+        self.max_depth: int = 0
+        self.visited_states: int = 1
+
+    @property
+    def explored_states(self) -> int:
+        """Number of expansions in all iterations, as there is no closed list."""
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. set the bound to f(n) = h(n) of the starting State
+        2. run depth first search from the starting State, cutting off States with f(n) = g(n) + h(n) greater than the bound
+           and never making a move which undoes the previous one
+        3. if the target State with f(n) within the bound has been found -> return the path to it
+        4. else set the bound to the lowest f(n) which exceeded it and go to step 2
+        5. if no State exceeded the bound -> return None
+
+        Only the current path is kept in memory, so memory usage is O(depth) instead of O(nodes) in A*.
+
+        :param state: A starting State of the puzzle
+        :return: A list of consecutive operations conducted on an initial array to achieve a target array -- a solved puzzle.
+        If no solution has been found - return None
+        """
+        bound: int | float = self.heuristic.evaluate(state)
+        self._start_progress()
+        while True:
+            result = self._search(state, 0, bound)
+            if result == FOUND:
+                logger.info(
+                    f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={self.solution.get_path_to_state()}"
+                )
+                return self.solution.get_path_to_state()
+            if result == math.inf:
+                logger.info("PUZZLE NOT SOLVED")
+                return None
+            logger.info(f"Bound {bound} exhausted, next bound {result}.")
+            bound = result
+
+    def _search(self, state: State, g: int, bound: int | float) -> int | float:
+        """
+        Search depth first from a State within the bound.
+
+        :return: FOUND if the target State has been found, else the lowest f(n) exceeding the bound
+        (math.inf if there was none).
+        """
+        f = g + state.h_value
+        if f > bound:
+            return f
+        if state.is_target_state():
+            self.solution = state
+            return FOUND
+
+        self.expanded_states += 1
+        if self.expanded_states >= self._next_progress:
+            # The frontier of IDA* is the current path
+            self._checkpoint(g, g)
+        minimum: int | float = math.inf
+        query_order = self.neighbors_query_order
+        if state.preceding_operator is not None:
+            query_order = query_order.replace(
+                OPPOSITE_MOVES[state.preceding_operator[0].upper()], ""
+            )
+        for neighbor in state.get_neighbors(query_order):
+            self.visited_states += 1
+            if self.max_depth < g + 1:
+                self.max_depth = g + 1
+            self.heuristic.evaluate(neighbor)
+            result = self._search(neighbor, g + 1, bound)
+            if result == FOUND:
+                return FOUND
+            minimum = min(minimum, result)
+        return minimum
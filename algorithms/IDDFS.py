@@ -0,0 +1,87 @@
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from memory.State import OPPOSITE_MOVES, State
+
+# The hardest 4x4 puzzles need 80 moves
+DEFAULT_MAX_LIMIT: int = 80
+
+
+class IDDFS(BaseAlgorithm):
+    """A class for Iterative Deepening Depth First Search algorithm initialised with algorithm parameters."""
+
+    def __init__(self, neighbors_query_order: str, limit: int = DEFAULT_MAX_LIMIT):
+        self.neighbors_query_order = neighbors_query_order
+        self.limit = limit  # the highest depth limit tried
+        self.solution: State | None = None
+        self.path_hashes: set[int] = set()  # hashes of States on the current path
+        self.expanded_states: int = 0
+        self.max_depth: int = 0
+        self.visited_states: int = 1
+
+    @property
+    def explored_states(self) -> int:
+        """Number of expansions in all iterations, as there is no closed list."""
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. check if starting State is the target State, if yes return the path to it, else proceed
+        2. set the depth limit to 1
+        3. run depth first search from the starting State up to the depth limit, never making a move which undoes
+           the previous one nor going back to a State which is already on the current path
+        4. if the target State has been found -> return the path to it
+        5. else increase the depth limit by 1 and go to step 3, unless the limit exceeds the maximum -> return None
+
+        Every iteration searches all paths up to the depth limit, so the first solution found is the shortest one.
+        Only the current path is kept in memory, so memory usage is O(depth).
+
+        :param state: A starting State of the puzzle
+        :return: A list of consecutive operations conducted on an initial array to achieve a target array -- a solved puzzle.
+        If no solution has been found - return None
+        """
+        if state.is_target_state():
+            return state.get_path_to_state()
+
+        self._start_progress()
+        for depth_limit in range(1, self.limit + 1):
+            self.path_hashes = {hash(state)}
+            if self._search(state, depth_limit):
+                path = self.solution.get_path_to_state()
+                logger.info(f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={path}")
+                return path
+            logger.info(f"Depth limit {depth_limit} exhausted.")
+        logger.info("PUZZLE NOT SOLVED")
+        return None
+
+    def _search(self, state: State, remaining_depth: int) -> bool:
+        """
+        Search depth first from a State, making at most remaining_depth moves.
+
+        :return: True if the target State has been found and stored in self.solution
+        """
+        self.expanded_states += 1
+        if self.expanded_states >= self._next_progress:
+            # The frontier of IDDFS is the current path
+            self._checkpoint(state.depth, state.depth)
+        query_order = self.neighbors_query_order
+        if state.preceding_operator is not None:
+            query_order = query_order.replace(
+                OPPOSITE_MOVES[state.preceding_operator[0].upper()], ""
+            )
+        for neighbor in state.get_neighbors(query_order):
+            self.visited_states += 1
+            if self.max_depth < neighbor.depth:
+                self.max_depth = neighbor.depth
+            if neighbor.is_target_state():
+                self.solution = neighbor
+                return True
+            neighbor_hash = hash(neighbor)
+            if remaining_depth > 1 and neighbor_hash not in self.path_hashes:
+                self.path_hashes.add(neighbor_hash)
+                found = self._search(neighbor, remaining_depth - 1)
+                self.path_hashes.discard(neighbor_hash)
+                if found:
+                    return True
+        return False
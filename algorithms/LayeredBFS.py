@@ -0,0 +1,134 @@
+import numpy as np
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from Exception import BoardTooLargeException
+from memory.Board import get_goal, get_move_table
+from memory.State import DIRECTIONS_STR_MAPPING, State
+
+
+class LayeredBFS(BaseAlgorithm):
+    """
+    A class for level-synchronous Breadth First Search initialised with an algorithm parameter.
+
+    The whole frontier is kept as one 2D array of boards (one flattened board per row) and expanded at once with
+    vectorized numpy operations, instead of creating a State for every node.
+    """
+
+    def __init__(self, neighbors_query_order: str):
+        self.visited_states = 1  # because we always check at least the initial state
+        self.max_depth = 0
+        self.expanded_states = 0
+        self.neighbors_query_order = neighbors_query_order
+
+    @property
+    def explored_states(self) -> int:
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. check if a State is the target array, if yes return, else:
+        2. for all boards in the frontier generate boards with 0 moved in each direction of the query order at once
+        3. if any of them is the target board return the path to the first one, else
+        4. make the next frontier from boards not seen before in order of generation and go to step 2
+
+        Boards are compared by keys packing a board into a 64-bit integer. Seen keys are kept in a sorted array.
+        The order of generated boards and therefore solutions and stats are the same as in BFS.
+
+        :param state: An initial State of the puzzle
+        :return: A list of consecutive operations conducted on an initial State to achieve a target State -- a solved puzzle.
+                 If no solution has been found - return None
+        """
+        if state.is_target_state():
+            logger.info("Initial State is target State. Returning [].")
+            return ""
+
+        shape = state.get_state_shape()
+        n_cells = shape[0] * shape[1]
+        bits_per_tile = 4 if n_cells <= 16 else 8
+        if n_cells * bits_per_tile > 64:
+            logger.error(f"Board of shape {shape} cannot be packed into 64 bits.")
+            raise BoardTooLargeException(
+                f"Board of shape {shape} cannot be packed into 64 bits."
+            )
+        shifts = np.arange(n_cells, dtype=np.uint64) * np.uint64(bits_per_tile)
+
+        # swap_table[blank, i] is an index of a tile swapped with 0 moving in i-th direction of the query order or -1
+        directions = [
+            DIRECTIONS_STR_MAPPING[letter] for letter in self.neighbors_query_order
+        ]
+        swap_table = np.array(
+            [
+                [
+                    -1 if moves[direction] is None else moves[direction]
+                    for direction in directions
+                ]
+                for moves in get_move_table(shape)
+            ]
+        )
+
+        goal_key = self._pack(
+            get_goal(shape).array.reshape(1, n_cells).astype(np.uint8), shifts
+        )[0]
+        boards = np.asarray(state.array, dtype=np.uint8).reshape(1, n_cells)
+        blanks = np.array([int(np.argmin(boards[0]))])
+        seen = self._pack(boards, shifts)  # sorted keys of all boards seen so far
+        # For every layer: (index of a parent in the previous layer, index of a direction) of each board in the layer
+        layers: list[tuple[np.ndarray, np.ndarray]] = []
+
+        self._start_progress()
+        while len(boards):
+            # Row-major nonzero keeps the order of BFS: parents in frontier order, directions in query order
+            targets = swap_table[blanks]
+            parents, moves = np.nonzero(targets >= 0)
+            swap_with = targets[parents, moves]
+            rows = np.arange(len(parents))
+            children = boards[parents]
+            children[rows, blanks[parents]] = children[rows, swap_with]
+            children[rows, swap_with] = 0
+            keys = self._pack(children, shifts)
+            self.max_depth = len(layers) + 1
+
+            found = np.flatnonzero(keys == goal_key)
+            if len(found):
+                first = found[0]
+                self.visited_states += int(first) + 1
+                self.expanded_states += int(parents[first]) + 1
+                path = self._get_path(layers, int(parents[first]), int(moves[first]))
+                logger.info(f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={path}")
+                return path
+            self.visited_states += len(keys)
+            self.expanded_states += len(boards)
+            if self.expanded_states >= self._next_progress:
+                self._checkpoint(len(boards), len(layers))
+
+            # First occurrences of keys which haven't been seen in previous layers, in order of generation
+            unique_keys, first_indexes = np.unique(keys, return_index=True)
+            positions = np.minimum(np.searchsorted(seen, unique_keys), len(seen) - 1)
+            is_new = seen[positions] != unique_keys
+            new_indexes = np.sort(first_indexes[is_new])
+            seen = np.union1d(seen, unique_keys[is_new])
+
+            layers.append((parents[new_indexes], moves[new_indexes]))
+            boards = children[new_indexes]
+            blanks = swap_with[new_indexes]
+
+        logger.info("PUZZLE NOT SOLVED")
+        return None
+
+    @staticmethod
+    def _pack(boards: np.ndarray, shifts: np.ndarray) -> np.ndarray:
+        """Pack each row of a 2D array of boards into one 64-bit integer key."""
+        return np.bitwise_or.reduce(boards.astype(np.uint64) << shifts, axis=1)
+
+    def _get_path(
+        self, layers: list[tuple[np.ndarray, np.ndarray]], parent: int, move: int
+    ) -> str:
+        """Follow parent indexes back through the layers to get the path to a board generated from the last layer."""
+        path: list[str] = [self.neighbors_query_order[move]]
+        for parents, moves in reversed(layers):
+            path.append(self.neighbors_query_order[moves[parent]])
+            parent = parents[parent]
+        path.reverse()
+        return "".join(path)
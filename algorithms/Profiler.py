@@ -0,0 +1,213 @@
+import cProfile
+import functools
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.CachedAlgorithm import CachedAlgorithm
+from algorithms.Heuristic import Heuristic
+from memory.PackedState import PackedState
+from memory.PriorityQueue import PriorityQueue
+from memory.State import State
+
+# Tools which can wrap a profiled run besides phase counters
+PROFILE_TOOLS: tuple[str, ...] = ("cprofile", "tracemalloc")
+# Number of functions (cProfile) and allocation sites (tracemalloc) in a report
+TOP_ENTRIES: int = 30
+
+# {phase: methods timed as the phase while profiling}
+PHASE_METHODS: dict[str, list[tuple[type, str]]] = {
+    "neighbors": [(State, "get_neighbors"), (PackedState, "get_neighbors")],
+    "hashing": [(State, "__hash__"), (PackedState, "__hash__")],
+    "goal_checks": [(State, "is_target_state"), (PackedState, "is_target_state")],
+    "heuristic": [(Heuristic, "evaluate")],
+    "open_list": [
+        (PriorityQueue, "push"),
+        (PriorityQueue, "pop"),
+        (PriorityQueue, "remove"),
+    ],
+    "duplicate_checks": [(PriorityQueue, "__contains__"), (PriorityQueue, "get")],
+}
+# Attributes of algorithms with sets and dicts of seen States, looking a State up in them is a duplicate check
+SEEN_ATTRIBUTES: tuple[str, ...] = (
+    "closed_list",
+    "backward_closed_list",
+    "seen",
+    "path_hashes",
+    "best_states",
+)
+
+
+class Profiler:
+    """
+    Counts calls and measures time of the phases of a search: neighbor generation, hashing, goal checks,
+    heuristic evaluation, open list operations and duplicate checks.
+
+    Methods of the phases are replaced with timed ones only inside profile(), so a search which isn't profiled
+    runs the original methods and pays nothing. Times of a phase exclude nested phases (e.g. hashing inside a duplicate
+    check) and include the overhead of timing, which is significant for cheap calls like a cached hash.
+    Searches which don't call these methods (lbfs works on arrays of boards) only get the total time.
+
+    Optionally the run is wrapped in cProfile or tracemalloc as well.
+    """
+
+    def __init__(self, tool: str | None = None):
+        if tool is not None and tool not in PROFILE_TOOLS:
+            logger.error(f"Unsupported profile tool: {tool}.")
+            raise ValueError(
+                f"Unsupported profile tool: {tool}, expected one of {PROFILE_TOOLS}."
+            )
+        self.tool = tool
+        self.calls: dict[str, int] = dict.fromkeys(PHASE_METHODS, 0)
+        self.times: dict[str, float] = dict.fromkeys(PHASE_METHODS, 0.0)
+        self.total_time: float = 0.0
+        # Time spent in nested phases of each running phase, the bottom one collects top-level phases
+        self._nested_times: list[float] = [0.0]
+        self._cprofile: cProfile.Profile | None = None
+        self._memory_peak: int | None = None
+        self._memory_top: list[tracemalloc.Statistic] = []
+
+    @contextmanager
+    def profile(self, algorithm: BaseAlgorithm) -> Iterator[None]:
+        """Profile everything run inside the context, e.g. solving a puzzle with the algorithm."""
+        originals = [
+            (cls, name, cls.__dict__[name])
+            for methods in PHASE_METHODS.values()
+            for cls, name in methods
+        ]
+        for phase, methods in PHASE_METHODS.items():
+            for cls, name in methods:
+                setattr(cls, name, self._timed(phase, cls.__dict__[name]))
+        self._time_duplicate_checks(algorithm)
+
+        if self.tool == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.tool == "tracemalloc":
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.total_time += time.perf_counter() - start_time
+            if self._cprofile is not None:
+                self._cprofile.disable()
+            elif self.tool == "tracemalloc":
+                self._memory_peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                self._memory_top = snapshot.statistics("lineno")[:TOP_ENTRIES]
+                tracemalloc.stop()
+            for cls, name, method in originals:
+                setattr(cls, name, method)
+
+    def _timed(self, phase: str, function: Callable) -> Callable:
+        """Return a function which counts its calls and measures its time as the phase."""
+        nested_times = self._nested_times
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            nested_times.append(0.0)
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                self.times[phase] += elapsed - nested_times.pop()
+                self.calls[phase] += 1
+                nested_times[-1] += elapsed
+
+        return timed
+
+    def _time_duplicate_checks(self, algorithm: BaseAlgorithm) -> None:
+        """Replace sets and dicts of seen States of an algorithm with ones timing lookups as duplicate checks."""
+        if isinstance(algorithm, CachedAlgorithm):
+            algorithm = algorithm.algorithm
+        for attribute in SEEN_ATTRIBUTES:
+            seen = getattr(algorithm, attribute, None)
+            if type(seen) not in (set, dict):
+                continue
+            methods = {
+                "__contains__": self._timed("duplicate_checks", type(seen).__contains__)
+            }
+            if isinstance(seen, dict):
+                methods["get"] = self._timed("duplicate_checks", dict.get)
+            timed_type = type(f"Timed{type(seen).__name__}", (type(seen),), methods)
+            setattr(algorithm, attribute, timed_type(seen))
+
+    def report(self) -> dict:
+        """Return a JSON-serializable report of the profiled run, times in milliseconds."""
+        total_ms = self.total_time * 1000.0
+        phases = {
+            phase: {
+                "calls": self.calls[phase],
+                "time_ms": round(self.times[phase] * 1000.0, 3),
+                "share": (
+                    round(self.times[phase] / self.total_time, 4)
+                    if self.total_time
+                    else 0.0
+                ),
+            }
+            for phase in PHASE_METHODS
+        }
+        report = {
+            "time_ms": round(total_ms, 3),
+            "phases": phases,
+            # The loop of the algorithm itself and everything not covered by the phases
+            "other_time_ms": round(
+                total_ms - sum(phase["time_ms"] for phase in phases.values()), 3
+            ),
+        }
+        if self._cprofile is not None:
+            stats = pstats.Stats(self._cprofile).sort_stats(pstats.SortKey.CUMULATIVE)
+            report["cprofile"] = []
+            # Timing wrappers of the phases are left out, their functions are listed under their own names
+            functions = [
+                function for function in stats.fcn_list if function[0] != __file__
+            ]
+            for function in functions[:TOP_ENTRIES]:
+                file, line, name = function
+                _, calls, total_time, cumulative_time, _ = stats.stats[function]
+                report["cprofile"].append(
+                    {
+                        "function": f"{file}:{line}({name})",
+                        "calls": calls,
+                        "time_ms": round(total_time * 1000.0, 3),
+                        "cumulative_time_ms": round(cumulative_time * 1000.0, 3),
+                    }
+                )
+        if self._memory_peak is not None:
+            report["tracemalloc"] = {
+                "peak_mb": round(self._memory_peak / 2**20, 3),
+                "top": [
+                    {
+                        "location": str(statistic.traceback),
+                        "size_mb": round(statistic.size / 2**20, 3),
+                        "count": statistic.count,
+                    }
+                    for statistic in self._memory_top
+                ],
+            }
+        return report
+
+    def write_report(self, stats_path: str | Path, **run_info) -> Path:
+        """
+        Write the report as JSON next to a stats file, e.g. x_stats.txt -> x_stats.profile.json, and return its path.
+        With cProfile its raw stats are also dumped to x_stats.prof, e.g. for snakeviz.
+
+        :param run_info: added to the report, e.g. strategy and input file
+        """
+        stats_path = Path(stats_path)
+        report_path = stats_path.with_suffix(".profile.json")
+        with open(report_path, "w") as report_file:
+            json.dump({**run_info, **self.report()}, report_file, indent=2)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(stats_path.with_suffix(".prof"))
+        logger.info(f"Profile report written to {report_path}.")
+        return report_path
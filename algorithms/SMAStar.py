@@ -0,0 +1,181 @@
+import itertools
+import math
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from algorithms.BaseAlgorithm import BaseAlgorithm
+from algorithms.Heuristic import HEURISTIC_TYPE, get_heuristic
+from memory.PriorityQueue import PriorityQueue
+from memory.State import OPPOSITE_MOVES, State
+
+DEFAULT_NODE_LIMIT: int = 100_000
+# A node with all 4 children has to fit in memory with the path to it
+MIN_NODE_LIMIT: int = 5
+
+
+@dataclass(slots=True)
+class SearchNode:
+    """A State in the search tree of SMA* with f(n) of its children which have been forgotten."""
+
+    state: State
+    parent: "SearchNode | None"
+    f: int | float
+    key: int
+    expanded: bool = False
+    children: int = 0  # children in memory
+    forgotten: dict[str, int | float] = field(
+        default_factory=dict
+    )  # {move: f(n) of a forgotten child}
+
+    @property
+    def value(self) -> int | float:
+        """f(n) of a State which hasn't been expanded, else the lowest f(n) of its forgotten children."""
+        return min(self.forgotten.values()) if self.expanded else self.f
+
+
+class SMAStar(BaseAlgorithm):
+    """
+    A class for simplified memory-bounded A* (SMA*) algorithm initialised with algorithm parameters.
+
+    It's A* which keeps at most `nodes` States of its search tree in memory (plus children of the State being
+    expanded, until the next States are forgotten). When the tree grows beyond that, the leaves with the highest f(n)
+    are forgotten and their parents remember their f(n), so a forgotten branch is generated again only when it becomes
+    the most promising one.
+    """
+
+    def __init__(
+        self,
+        heuristic_type: HEURISTIC_TYPE,
+        nodes: int = DEFAULT_NODE_LIMIT,
+        neighbors_query_order: str = "LRUD",
+    ):
+        if nodes < MIN_NODE_LIMIT:
+            logger.error(f"SMA* needs at least {MIN_NODE_LIMIT} nodes, got {nodes}.")
+            raise ValueError(
+                f"SMA* needs at least {MIN_NODE_LIMIT} nodes, got {nodes}."
+            )
+        self.heuristic_type = heuristic_type
+        self.heuristic = get_heuristic(heuristic_type)
+        self.nodes = nodes
+        self.neighbors_query_order = neighbors_query_order
+        # States to expand: not expanded ones and ones with forgotten children, the most promising first
+        # (the lowest f(n), then the deepest)
+        self.open_list: PriorityQueue[SearchNode] = PriorityQueue()
+        # Leaves of the search tree, the least promising first (the highest f(n), then the shallowest)
+        self.leaves: PriorityQueue[SearchNode] = PriorityQueue()
+        self._keys = itertools.count()
+        self.stored_states: int = 0
+        self.max_stored_states: int = 0
+        self.forgotten_states: int = 0
+        self.expanded_states: int = 0
+        self.max_depth: int = 0
+        self.visited_states: int = 1
+
+    @property
+    def explored_states(self) -> int:
+        """Number of expansions, a State is expanded again when its forgotten children are generated again."""
+        return self.expanded_states
+
+    def _solve(self, state: State) -> str | None:
+        """
+        Steps of the algorithm:
+        1. add the starting State to the tree with f(n) = g(n) + h(n)
+        2. take the most promising State: the one with the lowest f(n) among States which haven't been expanded and
+           the lowest f(n) of forgotten children of expanded States; if it's infinite return None
+        3. if the State hasn't been expanded: if it's the target State return the path to it, else add all its
+           children, except the one undoing its move, with f(n) = max(f(parent), g(n) + h(n));
+           else add its forgotten children again with their remembered f(n)
+           (a child too deep to fit in memory with the path to it gets an infinite f(n))
+        4. while there are more than `nodes` States in the tree, forget the leaf with the highest f(n),
+           its parent remembers the move to it and its f(n)
+        5. go to step 2
+
+        With enough memory for the tree of A* it expands the same States as A*. With less, it finds the shortest
+        solution if the path to it fits in memory, at the cost of expanding forgotten States again.
+
+        :param state: A starting State of the puzzle
+        :return: A list of consecutive operations conducted on an initial array to achieve a target array -- a solved puzzle.
+        If no solution has been found - return None
+        """
+        root = SearchNode(state, None, self.heuristic.evaluate(state), next(self._keys))
+        self._push(root)
+        self.leaves.push(root.key, root, (-root.value, state.depth))
+        self.stored_states = self.max_stored_states = 1
+        self._start_progress()
+
+        while self.open_list:
+            _, node = self.open_list.pop()
+            if node.value == math.inf:
+                break
+            if not node.expanded and node.state.is_target_state():
+                path = node.state.get_path_to_state()
+                logger.info(f"PUZZLE SOLVED - DEPTH={self.max_depth}, path={path}")
+                return path
+
+            self.expanded_states += 1
+            if self.expanded_states >= self._next_progress:
+                self._checkpoint(len(self.open_list), node.state.depth)
+            self._expand(node)
+            while self.stored_states > self.nodes:
+                self._forget_worst_leaf()
+
+        logger.info("PUZZLE NOT SOLVED")
+        return None
+
+    def _push(self, node: SearchNode) -> None:
+        """Add a State to the open list or update its priority."""
+        self.open_list.push(node.key, node, (node.value, -node.state.depth))
+
+    def _expand(self, node: SearchNode) -> None:
+        """Add all children of a State which hasn't been expanded, else its forgotten children."""
+        if node.expanded:
+            query_order = "".join(node.forgotten)
+        else:
+            query_order = self.neighbors_query_order
+            if node.state.preceding_operator is not None:
+                query_order = query_order.replace(
+                    OPPOSITE_MOVES[node.state.preceding_operator[0].upper()], ""
+                )
+        if node.children == 0:
+            self.leaves.remove(node.key)
+
+        for neighbor in node.state.get_neighbors(query_order):
+            self.visited_states += 1
+            depth = neighbor.depth
+            if self.max_depth < depth:
+                self.max_depth = depth
+            h = self.heuristic.evaluate(neighbor)
+            # The path from the root to a child which isn't the target has to leave room for the child's children
+            if depth >= self.nodes - 1 and not neighbor.is_target_state():
+                f = math.inf
+            else:
+                move = neighbor.preceding_operator[0].upper()
+                f = max(node.forgotten.get(move, node.f), depth + h)
+            child = SearchNode(neighbor, node, f, next(self._keys))
+            self._push(child)
+            self.leaves.push(child.key, child, (-child.value, depth))
+            node.children += 1
+            self.stored_states += 1
+        if self.stored_states > self.max_stored_states:
+            self.max_stored_states = self.stored_states
+
+        node.expanded = True
+        node.forgotten.clear()
+        if not node.children:  # a dead end
+            node.forgotten[""] = math.inf
+            self.leaves.push(node.key, node, (-node.value, node.state.depth))
+
+    def _forget_worst_leaf(self) -> None:
+        """Remove the leaf with the highest f(n) from the tree, its parent remembers the move to it and its f(n)."""
+        key, leaf = self.leaves.pop()
+        if key in self.open_list:
+            self.open_list.remove(key)
+        self.stored_states -= 1
+        self.forgotten_states += 1
+        parent = leaf.parent
+        parent.children -= 1
+        parent.forgotten[leaf.state.preceding_operator[0].upper()] = leaf.value
+        self._push(parent)
+        if not parent.children:
+            self.leaves.push(parent.key, parent, (-parent.value, parent.state.depth))
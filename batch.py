@@ -0,0 +1,369 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import permutations
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger
+
+from Exception import UnsolvableBoardException
+from algorithms.BaseAlgorithm import TIMEOUT, BaseAlgorithm
+from algorithms.CachedAlgorithm import CachedAlgorithm
+from memory.PackedState import PackedState
+from memory.SolutionCache import SolutionCache
+from memory.State import State
+from program import (
+    ALGORITHMS,
+    configure_logging,
+    create_algorithm,
+    prepare_file,
+    solve_puzzle,
+    write_to_solution_file,
+    write_to_stats_file,
+)
+
+# Time after a timeout, at which SIGALRM interrupts a search which hasn't stopped itself at a budget check
+# (see BaseAlgorithm.timeout_s), e.g. while expanding a huge layer of lbfs
+TIMEOUT_GRACE_S: float = 1.0
+# Strategy_param standing for all 24 permutations of LRUD
+ALL_ORDERS: str = "*"
+SUMMARY_FIELDS: list[str] = [
+    "puzzle",
+    "strategy",
+    "param",
+    "status",
+    "n_moves",
+    "visited",
+    "explored",
+    "max_depth",
+    "time_ms",
+    "cache_hit",
+    "solution_file",
+    "stats_file",
+]
+
+
+@dataclass
+class Job:
+    """A single puzzle solved with a single strategy."""
+
+    puzzle: str
+    strategy: str
+    param: str
+    solution_file: str
+    stats_file: str
+    packed: bool = False
+    timeout: float | None = None
+    cache: str | None = None  # SQLite file of a SolutionCache
+    max_nodes: int | None = None
+    max_memory_mb: float | None = None
+
+
+def _summary_row(job: Job, **stats) -> dict:
+    """Return a summary row describing a job and its results."""
+    return {
+        "puzzle": job.puzzle,
+        "strategy": job.strategy,
+        "param": job.param,
+        **stats,
+        "solution_file": job.solution_file,
+        "stats_file": job.stats_file,
+    }
+
+
+@contextmanager
+def time_limit(seconds: float | None) -> Iterator[None]:
+    """
+    Raise TimeoutError in the current process after a number of seconds.
+
+    It relies on SIGALRM, so on platforms without it (Windows) the limit is not enforced.
+    """
+    if seconds is None or not hasattr(signal, "SIGALRM"):
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TimeoutError(f"Time limit of {seconds}s exceeded.")
+
+    previous_handler = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def hard_time_limit(timeout: float | None) -> float | None:
+    """Return a time limit for time_limit, which interrupts a search only if it doesn't stop itself at timeout."""
+    return None if timeout is None else timeout + TIMEOUT_GRACE_S
+
+
+def run_job(job: Job) -> dict:
+    """Solve a puzzle, write its solution and stats files and return a summary row. Runs in a worker process."""
+    algorithm = create_algorithm(
+        job.strategy, job.param, job.max_nodes, job.max_memory_mb, job.timeout
+    )
+    if job.cache is None:
+        return _run_job(job, algorithm)
+    cache = SolutionCache(Path(job.cache))
+    try:
+        return _run_job(job, CachedAlgorithm(algorithm, job.strategy, job.param, cache))
+    finally:
+        cache.close()
+
+
+def _run_job(job: Job, algorithm: BaseAlgorithm) -> dict:
+    state_type = PackedState if job.packed else State
+    with prepare_file(job.solution_file) as solution_file, prepare_file(
+        job.stats_file
+    ) as stats_file:
+        try:
+            with time_limit(hard_time_limit(job.timeout)):
+                moves, time_in_ms = solve_puzzle(
+                    algorithm, job.puzzle, solution_file, stats_file, state_type
+                )
+            if moves is not None:
+                status = "solved"
+            else:
+                # A search stopped by a budget has written stats gathered until then
+                status = algorithm.stop_reason or "not_solved"
+        except UnsolvableBoardException:
+            # solve_puzzle has written -1 and zero stats, the algorithm hasn't run
+            return _summary_row(
+                job,
+                status="unsolvable",
+                n_moves=-1,
+                visited=0,
+                explored=0,
+                max_depth=0,
+                time_ms=0.0,
+            )
+        except TimeoutError:
+            logger.error(f"{job.puzzle} {job.strategy} {job.param}: timed out.")
+            moves, time_in_ms, status = None, job.timeout * 1000.0, TIMEOUT
+            # Stats gathered until the search was interrupted
+            write_to_solution_file(moves, solution_file)
+            write_to_stats_file(
+                -1,
+                algorithm.visited_states,
+                algorithm.explored_states,
+                algorithm.max_depth,
+                time_in_ms,
+                stats_file,
+            )
+
+    return _summary_row(
+        job,
+        status=status,
+        n_moves=len(moves) if moves is not None else -1,
+        visited=algorithm.visited_states,
+        explored=algorithm.explored_states,
+        max_depth=algorithm.max_depth,
+        time_ms=round(time_in_ms, 3),
+        cache_hit=isinstance(algorithm, CachedAlgorithm) and algorithm.cache_hit,
+    )
+
+
+def find_puzzles(inputs: list[str]) -> list[Path]:
+    """Return puzzle files from a list of files, directories (all .txt files inside) and glob patterns."""
+    puzzles: list[Path] = []
+    for input_ in inputs:
+        path = Path(input_)
+        if path.is_dir():
+            puzzles.extend(sorted(path.glob("*.txt")))
+        elif path.is_file():
+            puzzles.append(path)
+        else:
+            puzzles.extend(sorted(Path(match) for match in glob.glob(input_)))
+    return puzzles
+
+
+def parse_strategies(specs: list[str]) -> list[tuple[str, str]]:
+    """
+    Parse strategies given as STRATEGY:PARAM[,PARAM...] into a list of (<strategy>, <param>) tuples.
+
+    parse_strategies(["astr:hamm,manh"]) -> [("astr", "hamm"), ("astr", "manh")]
+    parse_strategies(["bfs:*"]) -> [("bfs", "LRUD"), ("bfs", "LRDU"), ...all 24 permutations]
+    """
+    strategies: list[tuple[str, str]] = []
+    for spec in specs:
+        strategy, _, params = spec.partition(":")
+        if strategy not in ALGORITHMS or not params:
+            raise ValueError(f"Invalid strategy: {spec}, expected e.g. bfs:LRUD,RDUL")
+        for param in params.split(","):
+            if param == ALL_ORDERS:
+                strategies.extend(
+                    (strategy, "".join(order)) for order in permutations("LRUD")
+                )
+            else:
+                strategies.append((strategy, param))
+    return strategies
+
+
+def create_jobs(
+    puzzles: list[Path],
+    strategies: list[tuple[str, str]],
+    output_directory: Path,
+    packed: bool = False,
+    timeout: float | None = None,
+    cache: Path | None = None,
+    max_nodes: int | None = None,
+    max_memory_mb: float | None = None,
+) -> list[Job]:
+    """Create a job for each puzzle and strategy with output files named like 4x4_01_0001_bfs_rdul_sol.txt"""
+    jobs: list[Job] = []
+    for puzzle in puzzles:
+        for strategy, param in strategies:
+            # Options of a param, e.g. LRUD:limit=30, become part of the name: lrud-limit30
+            name = param.lower().replace(":", "-").replace("=", "")
+            prefix = output_directory / f"{puzzle.stem}_{strategy}_{name}"
+            jobs.append(
+                Job(
+                    puzzle=str(puzzle),
+                    strategy=strategy,
+                    param=param,
+                    solution_file=f"{prefix}_sol.txt",
+                    stats_file=f"{prefix}_stats.txt",
+                    packed=packed,
+                    timeout=timeout,
+                    cache=str(cache) if cache is not None else None,
+                    max_nodes=max_nodes,
+                    max_memory_mb=max_memory_mb,
+                )
+            )
+    return jobs
+
+
+def write_summary(rows: list[dict], path: Path) -> None:
+    """Write summary rows to a .jsonl file (one JSON object per line) or otherwise to a .csv file."""
+    with open(path, "w", newline="") as f:
+        if path.suffix == ".jsonl":
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def run_jobs(jobs: list[Job], workers: int | None = None) -> list[dict]:
+    """Run jobs in a pool of worker processes and return their summary rows in the order of jobs."""
+    rows: list[dict | None] = [None] * len(jobs)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=configure_logging
+    ) as executor:
+        futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                rows[i] = future.result()
+            except Exception as e:
+                logger.error(
+                    f"{jobs[i].puzzle} {jobs[i].strategy} {jobs[i].param}: {e}"
+                )
+                rows[i] = _summary_row(jobs[i], status="error")
+            print(
+                f"[{done}/{len(jobs)}] {jobs[i].puzzle} {jobs[i].strategy} {jobs[i].param}: {rows[i]['status']}"
+            )
+    return rows
+
+
+def main(argv: list[str]) -> None:
+    # Example: python program.py batch puzzles/ --strategy bfs:* --strategy astr:hamm,manh --workers 8 --timeout 60
+    parser = argparse.ArgumentParser(prog="program.py batch")
+    parser.add_argument(
+        "Inputs",
+        type=str,
+        nargs="+",
+        help="Puzzle .txt files, directories with them or glob patterns",
+    )
+    parser.add_argument(
+        "--strategy",
+        type=str,
+        action="append",
+        required=True,
+        help="STRATEGY:PARAM[,PARAM...], e.g. bfs:LRUD,RDUL or astr:hamm,manh; "
+        f"'{ALL_ORDERS}' stands for all permutations of LRUD. Repeat for each strategy",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("."),
+        help="Directory for solution and stats files (default: current directory)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Time limit for a single job in seconds",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Maximum number of States expanded in a single job",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Stop a job when its worker process uses this much memory (MB)",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        default=None,
+        help="Summary file, .csv or .jsonl (default: OUTPUT_DIR/summary.csv)",
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Keep boards packed in a single integer (up to 4x4) instead of a numpy array",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite file with cached solutions shared by all workers, see program.py --cache",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        strategies = parse_strategies(args.strategy)
+    except ValueError as e:
+        parser.error(str(e))
+    puzzles = find_puzzles(args.Inputs)
+    if not puzzles:
+        parser.error("No puzzle files found.")
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = create_jobs(
+        puzzles,
+        strategies,
+        args.output_dir,
+        args.packed,
+        args.timeout,
+        args.cache,
+        args.max_nodes,
+        args.max_memory_mb,
+    )
+    logger.info(f"Running {len(jobs)} jobs with {args.workers} workers.")
+    rows = run_jobs(jobs, args.workers)
+
+    summary_path = args.summary or args.output_dir / "summary.csv"
+    write_summary(rows, summary_path)
+    print(f"Summary: {summary_path}")
@@ -0,0 +1,163 @@
+import argparse
+import sys
+from pathlib import Path
+
+from batch import ALL_ORDERS, parse_strategies
+from benchmarks.compare import compare_runs, summarize
+from benchmarks.generator import generate_puzzles, write_puzzle
+from benchmarks.runner import (
+    DEFAULT_STRATEGIES,
+    _init_worker,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+
+
+def _add_puzzle_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--shape", type=str, default="4x4", help="Board shape (default: 4x4)"
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=8,
+        help="Puzzles are generated for depths 1...MAX_DEPTH (default: 8)",
+    )
+    parser.add_argument(
+        "--per-depth", type=int, default=2, help="Puzzles per depth (default: 2)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the generator (default: 0)"
+    )
+
+
+def _generate(args: argparse.Namespace):
+    rows, columns = args.shape.split("x")
+    return generate_puzzles(
+        (int(rows), int(columns)),
+        list(range(1, args.max_depth + 1)),
+        args.per_depth,
+        args.seed,
+    )
+
+
+def generate(args: argparse.Namespace) -> None:
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for puzzle in _generate(args):
+        print(write_puzzle(puzzle, args.output_dir))
+
+
+def run(args: argparse.Namespace) -> None:
+    strategies = (
+        parse_strategies(args.strategy) if args.strategy else DEFAULT_STRATEGIES
+    )
+    puzzles = _generate(args)
+    runs = run_benchmark(puzzles, strategies, args.timeout, args.workers)
+    save_results(
+        runs,
+        args.output,
+        shape=args.shape,
+        max_depth=args.max_depth,
+        per_depth=args.per_depth,
+        seed=args.seed,
+        timeout=args.timeout,
+        workers=args.workers,
+    )
+    for (strategy, param), (time_s, nodes_per_s) in sorted(summarize(runs).items()):
+        print(f"{strategy} {param}: {time_s:.3f}s, {nodes_per_s:.0f} nodes/s")
+    print(f"Results: {args.output}")
+
+
+def compare(args: argparse.Namespace) -> None:
+    old, new = load_results(args.Old), load_results(args.New)
+    old_summary, new_summary = summarize(old), summarize(new)
+    for key in sorted(old_summary.keys() & new_summary.keys()):
+        old_time, _ = old_summary[key]
+        new_time, _ = new_summary[key]
+        print(f"{key[0]} {key[1]}: {old_time:.3f}s -> {new_time:.3f}s")
+
+    differences = compare_runs(old, new, args.threshold, args.min_time)
+    for difference in differences:
+        print(
+            f"{difference.reason.upper()}: {difference.puzzle} {difference.strategy} {difference.param} "
+            f"{difference.old_time_s:.4f}s -> {difference.new_time_s:.4f}s (x{difference.ratio:.2f})"
+        )
+    if differences:
+        print(f"{len(differences)} regressions.")
+        sys.exit(1)
+    print("No regressions.")
+
+
+def main(argv: list[str]) -> None:
+    # Example: python -m benchmarks run --max-depth 10 --output before.json
+    #          python -m benchmarks compare before.json after.json
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser(
+        "generate", help="Write benchmark puzzles to files"
+    )
+    _add_puzzle_arguments(generate_parser)
+    generate_parser.add_argument(
+        "--output-dir", type=Path, default=Path("puzzles"), help="(default: puzzles)"
+    )
+    generate_parser.set_defaults(function=generate)
+
+    run_parser = commands.add_parser(
+        "run", help="Run strategies on generated puzzles and save results as JSON"
+    )
+    _add_puzzle_arguments(run_parser)
+    run_parser.add_argument(
+        "--strategy",
+        type=str,
+        action="append",
+        help=f"STRATEGY:PARAM[,PARAM...] like in batch command, '{ALL_ORDERS}' stands for all permutations of LRUD "
+        "(default: bfs and dfs in all orders, astr with hamm and manh)",
+    )
+    run_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Time limit for a single run in seconds (default: 30)",
+    )
+    run_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes running at once, 1 gives the most stable timings (default: 1)",
+    )
+    run_parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark.json"),
+        help="(default: benchmark.json)",
+    )
+    run_parser.set_defaults(function=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two result files, exit with 1 if there are regressions"
+    )
+    compare_parser.add_argument("Old", type=Path, help="Baseline results")
+    compare_parser.add_argument("New", type=Path, help="Results to check")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown flagged as a regression (default: 0.1, i.e. 10%%)",
+    )
+    compare_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.005,
+        help="Slowdowns smaller than this many seconds are ignored (default: 0.005)",
+    )
+    compare_parser.set_defaults(function=compare)
+
+    args = parser.parse_args(argv)
+    args.function(args)
+
+
+if __name__ == "__main__":
+    _init_worker()
+    main(sys.argv[1:])
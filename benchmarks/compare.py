@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+from benchmarks.runner import BenchmarkRun
+
+
+@dataclass
+class Difference:
+    """A run which got slower or gave different results than in the baseline."""
+
+    puzzle: str
+    strategy: str
+    param: str
+    reason: str  # slower | results changed | timeout
+    old_time_s: float
+    new_time_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.new_time_s / self.old_time_s if self.old_time_s else float("inf")
+
+
+def compare_runs(
+    old: list[BenchmarkRun],
+    new: list[BenchmarkRun],
+    threshold: float = 0.1,
+    min_time_s: float = 0.005,
+) -> list[Difference]:
+    """
+    Compare runs of the same puzzles and strategies from two benchmarks.
+
+    :param old: baseline runs
+    :param new: runs to check
+    :param threshold: relative slowdown flagged as a regression, 0.1 means 10% slower
+    :param min_time_s: slowdowns smaller than this are ignored as noise
+    :return: regressions and runs whose solutions or stats differ, runs missing from either side are skipped
+    """
+    old_runs = {(run.puzzle, run.strategy, run.param): run for run in old}
+    differences: list[Difference] = []
+    for run in new:
+        old_run = old_runs.get((run.puzzle, run.strategy, run.param))
+        if old_run is None:
+            continue
+        reason = None
+        if run.status == "timeout" and old_run.status != "timeout":
+            reason = "timeout"
+        elif run.status == old_run.status == "solved" and (
+            run.n_moves,
+            run.visited,
+            run.explored,
+        ) != (old_run.n_moves, old_run.visited, old_run.explored):
+            reason = "results changed"
+        elif (
+            run.time_s > old_run.time_s * (1 + threshold)
+            and run.time_s - old_run.time_s > min_time_s
+        ):
+            reason = "slower"
+        if reason:
+            differences.append(
+                Difference(
+                    puzzle=run.puzzle,
+                    strategy=run.strategy,
+                    param=run.param,
+                    reason=reason,
+                    old_time_s=old_run.time_s,
+                    new_time_s=run.time_s,
+                )
+            )
+    return differences
+
+
+def summarize(runs: list[BenchmarkRun]) -> dict[tuple[str, str], tuple[float, float]]:
+    """Return {(strategy, param): (total time in seconds, mean nodes/s)} of solved runs."""
+    groups: dict[tuple[str, str], list[BenchmarkRun]] = {}
+    for run in runs:
+        if run.status == "solved":
+            groups.setdefault((run.strategy, run.param), []).append(run)
+    return {
+        key: (
+            sum(run.time_s for run in group),
+            sum(run.nodes_per_s for run in group) / len(group),
+        )
+        for key, group in groups.items()
+    }
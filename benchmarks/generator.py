@@ -0,0 +1,81 @@
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from memory.Board import get_goal, get_move_table
+from memory.State import DIRECTIONS_STR_MAPPING, OPPOSITE_MOVES
+
+
+@dataclass
+class Puzzle:
+    """A benchmark puzzle generated with a random walk of a given number of moves from the target board."""
+
+    name: str  # e.g. 4x4_05_0001, like names of puzzle files
+    depth: int  # length of the walk, the shortest solution is never longer
+    tiles: list[list[int]]
+
+
+def random_walk(
+    shape: tuple[int, int], n_moves: int, generator: random.Random
+) -> list[list[int]]:
+    """
+    Make n_moves random moves of 0 tile from the target board and return the board reached.
+
+    The walk never undoes its previous move and never returns to a board it has already passed, if it can avoid it,
+    so the shortest solution is close to n_moves for short walks.
+    """
+    move_table = get_move_table(shape)
+    tiles = [int(tile) for tile in get_goal(shape).array.flat]
+    blank = tiles.index(0)
+    seen = {tuple(tiles)}
+    previous: str | None = None
+    for _ in range(n_moves):
+        candidates = []
+        for move, direction in DIRECTIONS_STR_MAPPING.items():
+            swap_with = move_table[blank][direction]
+            if swap_with is None or (previous and move == OPPOSITE_MOVES[previous]):
+                continue
+            candidates.append((move, swap_with))
+        # Sorted, so that a seed always gives the same walk
+        fresh = [
+            (move, swap_with)
+            for move, swap_with in sorted(candidates)
+            if _swapped(tiles, blank, swap_with) not in seen
+        ]
+        previous, swap_with = generator.choice(fresh or sorted(candidates))
+        tiles[blank], tiles[swap_with] = tiles[swap_with], 0
+        blank = swap_with
+        seen.add(tuple(tiles))
+    return [tiles[row * shape[1] : (row + 1) * shape[1]] for row in range(shape[0])]
+
+
+def _swapped(tiles: list[int], blank: int, swap_with: int) -> tuple[int, ...]:
+    swapped = list(tiles)
+    swapped[blank], swapped[swap_with] = swapped[swap_with], 0
+    return tuple(swapped)
+
+
+def generate_puzzles(
+    shape: tuple[int, int], depths: list[int], per_depth: int, seed: int
+) -> list[Puzzle]:
+    """Generate per_depth puzzles for each depth. The same arguments always give the same puzzles."""
+    generator = random.Random(seed)
+    return [
+        Puzzle(
+            name=f"{shape[0]}x{shape[1]}_{depth:02d}_{number:04d}",
+            depth=depth,
+            tiles=random_walk(shape, depth, generator),
+        )
+        for depth in depths
+        for number in range(1, per_depth + 1)
+    ]
+
+
+def write_puzzle(puzzle: Puzzle, directory: Path) -> Path:
+    """Write a puzzle to a file in the format read by State.load_state, return the file's path."""
+    path = directory / f"{puzzle.name}.txt"
+    rows = [" ".join(str(tile) for tile in row) for row in puzzle.tiles]
+    path.write_text(
+        f"{len(puzzle.tiles)} {len(puzzle.tiles[0])}\n" + "\n".join(rows) + "\n"
+    )
+    return path
@@ -0,0 +1,133 @@
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from dataclasses import asdict, dataclass
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from batch import time_limit
+from benchmarks.generator import Puzzle
+from memory.State import State
+from program import create_algorithm
+
+# bfs and dfs in all 24 query orders, astr with both heuristics
+DEFAULT_STRATEGIES: list[tuple[str, str]] = [
+    (strategy, "".join(order))
+    for strategy in ("bfs", "dfs")
+    for order in permutations("LRUD")
+] + [("astr", "hamm"), ("astr", "manh")]
+
+
+@dataclass
+class BenchmarkRun:
+    """Results of solving one puzzle with one strategy, in a fresh process."""
+
+    puzzle: str
+    depth: int
+    strategy: str
+    param: str
+    status: str  # solved | not_solved | timeout
+    n_moves: int
+    visited: int
+    explored: int
+    max_depth: int
+    time_s: float
+    nodes_per_s: float  # visited States per second
+    peak_rss_kb: int  # peak resident memory of the process, including the interpreter
+
+
+def _init_worker() -> None:
+    """Only errors are logged in benchmark processes, so that logging doesn't affect timings."""
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+
+def run_one(
+    puzzle: Puzzle, strategy: str, param: str, timeout: float | None = None
+) -> BenchmarkRun:
+    """Solve a puzzle with a strategy and measure it with time.perf_counter."""
+    algorithm = create_algorithm(strategy, param)
+    state = State(array=np.array(puzzle.tiles))
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            moves = algorithm.solve(state)
+        status = "solved" if moves is not None else "not_solved"
+    except TimeoutError:
+        moves, status = None, "timeout"
+    time_s = time.perf_counter() - start
+    return BenchmarkRun(
+        puzzle=puzzle.name,
+        depth=puzzle.depth,
+        strategy=strategy,
+        param=param,
+        status=status,
+        n_moves=len(moves) if moves is not None else -1,
+        visited=algorithm.visited_states,
+        explored=algorithm.explored_states,
+        max_depth=algorithm.max_depth,
+        time_s=time_s,
+        nodes_per_s=algorithm.visited_states / time_s if time_s else 0.0,
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        // (1024 if sys.platform == "darwin" else 1),
+    )
+
+
+def _run_one(arguments: tuple[Puzzle, str, str, float | None]) -> BenchmarkRun:
+    return run_one(*arguments)
+
+
+def run_benchmark(
+    puzzles: list[Puzzle],
+    strategies: list[tuple[str, str]],
+    timeout: float | None = None,
+    workers: int = 1,
+) -> list[BenchmarkRun]:
+    """
+    Run every strategy on every puzzle, each run in a new process.
+
+    A new (spawned) process per run gives each run clean caches and its own peak RSS. Keep workers at 1 for stable
+    timings, more workers make a quick check faster.
+    """
+    tasks = [
+        (puzzle, strategy, param, timeout)
+        for puzzle in puzzles
+        for strategy, param in strategies
+    ]
+    runs: list[BenchmarkRun] = []
+    with multiprocessing.get_context("spawn").Pool(
+        processes=workers, initializer=_init_worker, maxtasksperchild=1
+    ) as pool:
+        for done, run in enumerate(pool.imap(_run_one, tasks), start=1):
+            runs.append(run)
+            print(
+                f"[{done}/{len(tasks)}] {run.puzzle} {run.strategy} {run.param}: "
+                f"{run.status} {run.time_s:.4f}s {run.nodes_per_s:.0f} nodes/s"
+            )
+    return runs
+
+
+def save_results(runs: list[BenchmarkRun], path: Path, **meta) -> None:
+    """Save runs to a JSON file with metadata describing the benchmark and the machine."""
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            **meta,
+        },
+        "runs": [asdict(run) for run in runs],
+    }
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Path) -> list[BenchmarkRun]:
+    return [BenchmarkRun(**run) for run in json.loads(path.read_text())["runs"]]
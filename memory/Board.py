@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+BITS_PER_TILE: int = 4
+TILE_MASK: int = (1 << BITS_PER_TILE) - 1
+MAX_CELLS: int = 16  # 16 tiles * 4 bits = one 64-bit integer
+
+# {shape: [{direction: flat index of the tile swapped with 0 or None}, ...for each 0 position]}
+_MOVE_TABLES: dict[tuple[int, int], list[dict[str, int | None]]] = {}
+# {shape: Goal}
+_GOALS: dict[tuple[int, int], "Goal"] = {}
+
+
+def pack_tiles(tiles: list[int]) -> int:
+    """Pack a flat list of tiles into an integer, 4 bits per tile, first tile in the lowest bits."""
+    board = 0
+    for index, tile in enumerate(tiles):
+        board |= tile << (BITS_PER_TILE * index)
+    return board
+
+
+def unpack_tiles(board: int, n_cells: int) -> list[int]:
+    """Unpack an integer created with pack_tiles back into a flat list of tiles."""
+    return [(board >> (BITS_PER_TILE * index)) & TILE_MASK for index in range(n_cells)]
+
+
+def get_move_table(shape: tuple[int, int]) -> list[dict[str, int | None]]:
+    """Return (and cache) a table of legal moves for every position of 0 tile on a board of a given shape."""
+    if shape not in _MOVE_TABLES:
+        rows, columns = shape
+        table: list[dict[str, int | None]] = []
+        for index in range(rows * columns):
+            row, column = divmod(index, columns)
+            table.append(
+                {
+                    "left": index - 1 if column > 0 else None,
+                    "right": index + 1 if column < columns - 1 else None,
+                    "up": index - columns if row > 0 else None,
+                    "down": index + columns if row < rows - 1 else None,
+                }
+            )
+        _MOVE_TABLES[shape] = table
+    return _MOVE_TABLES[shape]
+
+
+@dataclass(frozen=True)
+class Goal:
+    """
+    Everything about the target board of a given shape that the algorithms need, computed once per shape.
+
+    An example target board for 4x4 array:
+    [[ 1,  2,  3,  4],
+     [ 5,  6,  7,  8],
+     [ 9, 10, 11, 12],
+     [13, 14, 15,  0]]
+    """
+
+    shape: tuple[int, int]
+    array: np.ndarray  # read-only
+    packed: (
+        int | None
+    )  # the board packed with pack_tiles or None if it doesn't fit in 64 bits
+    coords: tuple[
+        tuple[int, int], ...
+    ]  # target coords indexed by tile, 0 tile at the last position
+    _hashes: dict[np.dtype, int] = field(default_factory=dict, repr=False)
+
+    def get_hash(self, dtype: np.dtype) -> int:
+        """Return a hash of the target board stored in an array of a given dtype, as State.__hash__ computes it."""
+        if dtype not in self._hashes:
+            self._hashes[dtype] = hash(self.array.astype(dtype).tobytes())
+        return self._hashes[dtype]
+
+
+def get_goal(shape: tuple[int, int]) -> Goal:
+    """Return (and cache) the Goal for a board of a given shape."""
+    if shape not in _GOALS:
+        rows, columns = shape
+        n_cells = rows * columns
+        tiles = list(range(1, n_cells)) + [0]
+        array = np.array(tiles).reshape(shape)
+        array.setflags(write=False)
+        _GOALS[shape] = Goal(
+            shape=shape,
+            array=array,
+            packed=pack_tiles(tiles) if n_cells <= MAX_CELLS else None,
+            coords=tuple(
+                divmod((tile - 1) % n_cells, columns) for tile in range(n_cells)
+            ),
+        )
+    return _GOALS[shape]
+
+
+def is_solvable(tiles: list[int], shape: tuple[int, int]) -> bool:
+    """
+    Check if a board can be solved, i.e. if the target board can be reached from it.
+
+    Every move swaps 0 tile with another tile, which changes the parity of the permutation of all cells and the parity
+    of 0 tile's distance from its target position at once. So a board is solvable if and only if both parities are
+    equal, which covers the usual inversion counting rules for boards of odd and even width.
+
+    :param tiles: flat (row-major) list of all tiles including 0
+    :param shape: shape of the board
+    """
+    rows, columns = shape
+    n_cells = rows * columns
+    # Permutation parity from its cycles: a cycle of length k is k - 1 transpositions
+    target_indexes = [(tile - 1) % n_cells for tile in tiles]
+    visited = [False] * n_cells
+    transpositions = 0
+    for start in range(n_cells):
+        length = 0
+        index = start
+        while not visited[index]:
+            visited[index] = True
+            index = target_indexes[index]
+            length += 1
+        transpositions += max(length - 1, 0)
+    blank_row, blank_column = divmod(tiles.index(0), columns)
+    blank_distance = (rows - 1 - blank_row) + (columns - 1 - blank_column)
+    return transpositions % 2 == blank_distance % 2
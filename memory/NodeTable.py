@@ -0,0 +1,80 @@
+from array import array
+
+from memory.PackedState import PackedState
+
+# Moves are stored as 2-bit codes, an index in MOVES
+MOVES: str = "LRUD"
+MOVE_CODES: dict[str, int] = {move: code for code, move in enumerate(MOVES)}
+NO_PARENT: int = -1
+
+
+class NodeTable:
+    """
+    Search nodes stored column-wise in compact arrays instead of as State objects referencing their parents.
+
+    A node is a packed board (see memory.Board.pack_tiles), position of 0 tile, the move which led to it, its depth
+    and an index of its parent node in the same table. A node takes about 22 bytes and keeps no other node alive,
+    so a search can store millions of them. Paths are followed with a loop over indexes, not recursion.
+    """
+
+    def __init__(self, shape: tuple[int, int] = (4, 4)):
+        self.shape = shape
+        self.boards = array("Q")
+        self.blanks = array("B")
+        self.moves = array("B")
+        self.depths = array("I")
+        self.parents = array("q")
+
+    def __len__(self) -> int:
+        return len(self.boards)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by nodes' data."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self.boards,
+                self.blanks,
+                self.moves,
+                self.depths,
+                self.parents,
+            )
+        )
+
+    def add(self, state: PackedState, parent: int = NO_PARENT) -> int:
+        """
+        Add a node for a PackedState and return its index.
+
+        :param state: a PackedState, its move is taken from preceding_operator
+        :param parent: index of a parent node or NO_PARENT for the initial State
+        :return: index of the new node
+        """
+        self.boards.append(state.board)
+        self.blanks.append(state.blank)
+        if parent == NO_PARENT:
+            self.moves.append(0)
+            self.depths.append(0)
+        else:
+            self.moves.append(MOVE_CODES[state.preceding_operator[0].upper()])
+            self.depths.append(self.depths[parent] + 1)
+        self.parents.append(parent)
+        return len(self.boards) - 1
+
+    def get_state(self, index: int) -> PackedState:
+        """Return a PackedState of a node, without its parent."""
+        return PackedState(
+            board=self.boards[index], blank=self.blanks[index], shape=self.shape
+        )
+
+    def get_depth(self, index: int) -> int:
+        return self.depths[index]
+
+    def get_path(self, index: int) -> str:
+        """Get operations required to reach a node from the initial node."""
+        path: list[str] = []
+        while self.parents[index] != NO_PARENT:
+            path.append(MOVES[self.moves[index]])
+            index = self.parents[index]
+        path.reverse()
+        return "".join(path)
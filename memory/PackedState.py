@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from Exception import BoardTooLargeException
+from memory.Board import (
+    BITS_PER_TILE,
+    MAX_CELLS,
+    TILE_MASK,
+    get_goal,
+    get_move_table,
+    pack_tiles,
+    unpack_tiles,
+)
+from memory.State import DIRECTION, DIRECTIONS_STR_MAPPING, State
+
+
+@dataclass(eq=False, slots=True)
+class PackedState:
+    """
+    A compact alternative to State which keeps a whole board (up to 4x4) packed in one integer.
+
+    Tiles are stored 4 bits each in row-major order, so hashing and comparing States is a single integer operation
+    and a move is a couple of bit shifts instead of copying an ndarray.
+    """
+
+    board: int
+    blank: int  # flat (row-major) index of 0 tile
+    shape: tuple[int, int] = (4, 4)
+    heuristic_value: int | float | None = None
+    parent: Optional["PackedState"] = None
+    preceding_operator: DIRECTION | None = None
+    h_value: int | None = None  # h(n) of a heuristic used to find the State
+    # Number of moves from the initial State, derived from the parent's depth
+    depth: int | None = None
+
+    def __post_init__(self):
+        if self.depth is None:
+            self.depth = 0 if self.parent is None else self.parent.depth + 1
+
+    @staticmethod
+    def load_state(filepath: str) -> "PackedState":
+        """
+        Load initial PackedState for 15 puzzle from a file.
+
+        :param filepath: Path to txt file the with initial State
+        :return: A loaded PackedState
+        :raise IOError: If a file doesn't exist or cannot be accessed.
+        :raise BoardTooLargeException: If a board doesn't fit in 4 bits per tile.
+        """
+        return PackedState.from_array(State.load_state(filepath).array)
+
+    @staticmethod
+    def from_array(array: np.ndarray) -> "PackedState":
+        """Create a PackedState from a 2D array of tiles."""
+        shape: tuple[int, int] = array.shape
+        tiles: list[int] = [int(tile) for tile in array.flat]
+        if len(tiles) > MAX_CELLS or max(tiles) > TILE_MASK:
+            logger.error(f"Board of shape {shape} cannot be packed into 64 bits.")
+            raise BoardTooLargeException(
+                f"Board of shape {shape} cannot be packed into 64 bits."
+            )
+        return PackedState(board=pack_tiles(tiles), blank=tiles.index(0), shape=shape)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Unpacked board as a 2D array, e.g. for printing or heuristics which work on arrays."""
+        return np.array(
+            unpack_tiles(self.board, self.shape[0] * self.shape[1])
+        ).reshape(self.shape)
+
+    @property
+    def target_state(self) -> "PackedState":
+        n_cells = self.shape[0] * self.shape[1]
+        return PackedState(
+            board=get_goal(self.shape).packed, blank=n_cells - 1, shape=self.shape
+        )
+
+    def get_state_shape(self) -> tuple[int, int]:
+        """Return board's dimensions."""
+        return self.shape
+
+    def up(self) -> Optional["PackedState"]:
+        """Get a State and return a new one with 0 moved up or None if a move is illegal"""
+        return self._move("up")
+
+    def down(self) -> Optional["PackedState"]:
+        """Get a State and return a new one with 0 moved down or None if a move is illegal"""
+        return self._move("down")
+
+    def left(self) -> Optional["PackedState"]:
+        """Get a State and return a new one with 0 moved left or None if a move is illegal"""
+        return self._move("left")
+
+    def right(self) -> Optional["PackedState"]:
+        """Get a State and return a new one with 0 moved right or None if a move is illegal"""
+        return self._move("right")
+
+    def _find_zero(self) -> tuple[int, int]:
+        """Return zero-based coordinates for 0 tile as a tuple (<row>, <column>)"""
+        return divmod(self.blank, self.shape[1])
+
+    def find_coords(self, tile: int) -> tuple[int, int] | None:
+        """Find coords of selected tile in a State."""
+        for index in range(self.shape[0] * self.shape[1]):
+            if (self.board >> (BITS_PER_TILE * index)) & TILE_MASK == tile:
+                return divmod(index, self.shape[1])
+        logger.error(f"Coords for tile {tile} not found.")
+        return None
+
+    def get_moved_tile(self) -> tuple[int, tuple[int, int], tuple[int, int]]:
+        """Return a tile moved by the preceding operator as a tuple (<tile>, <coords before move>, <coords after move>)."""
+        tile = (self.board >> (BITS_PER_TILE * self.parent.blank)) & TILE_MASK
+        return (
+            tile,
+            divmod(self.blank, self.shape[1]),
+            divmod(self.parent.blank, self.shape[1]),
+        )
+
+    def _move(self, direction: DIRECTION) -> Optional["PackedState"]:
+        """
+        Return a new PackedState with 0 moved in a direction passed as parameter. If move is not possible return None.
+
+        :param direction: one of: "left" | "right" | "up" | "down"
+        :return: new PackedState with zero moved in a specified direction or None if a move is illegal.
+        """
+        swap_with: int | None = get_move_table(self.shape)[self.blank][direction]
+        if swap_with is None:
+            return None
+        tile = (self.board >> (BITS_PER_TILE * swap_with)) & TILE_MASK
+        # 0 tile has no bits set, so moving a tile is removing it from one slot and adding it to another
+        board = (
+            self.board
+            - (tile << (BITS_PER_TILE * swap_with))
+            + (tile << (BITS_PER_TILE * self.blank))
+        )
+        return PackedState(
+            board=board,
+            blank=swap_with,
+            shape=self.shape,
+            parent=self,
+            preceding_operator=direction,
+        )
+
+    def get_neighbors(self, neighbors_query_order: str = "LRUD") -> list["PackedState"]:
+        available_moves: list[PackedState] = []
+        for direction in neighbors_query_order:
+            if available := self._move(DIRECTIONS_STR_MAPPING[direction]):
+                available_moves.append(available)
+        return available_moves
+
+    def is_target_state(self) -> bool:
+        return self.board == get_goal(self.shape).packed
+
+    def get_path_to_state(self) -> str:
+        """Get a list of operations required to reach a current State from the first State (i.e. State without a parent)"""
+        path_to_state: list[str] = []
+        state: PackedState | None = self
+        while state is not None and state.preceding_operator is not None:
+            path_to_state.append(state.preceding_operator[0].upper())
+            state = state.parent
+        path_to_state.reverse()  # Because moves are listed last to first, and we want first to last
+        return "".join(path_to_state)
+
+    def get_state_depth(self) -> int:
+        """Get State's depth."""
+        return self.depth
+
+    def __hash__(self) -> int:
+        """We hash a state only by its board"""
+        return hash(self.board)
+
+    def __eq__(self, other) -> bool:
+        """We compare states only by comparing boards"""
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return self.board == other.board and self.shape == other.shape
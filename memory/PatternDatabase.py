@@ -0,0 +1,182 @@
+import mmap
+from collections import deque
+from pathlib import Path
+
+from loguru import logger
+
+from memory.Board import get_goal, get_move_table
+
+# Default location of pattern database files, shared by the generator and the solvers
+PDB_DIRECTORY: Path = Path(__file__).resolve().parent.parent / "pdb"
+PDB_SUFFIX: str = ".pdb"
+UNVISITED: int = 255
+
+# Default partitions of tiles into disjoint patterns
+DEFAULT_PATTERNS: dict[tuple[int, int], list[tuple[int, ...]]] = {
+    (3, 3): [(1, 2, 3, 4), (5, 6, 7, 8)],
+    (4, 4): [(1, 2, 5, 6, 9), (3, 4, 7, 8, 11), (10, 12, 13, 14, 15)],
+}
+
+
+def get_pattern_path(
+    shape: tuple[int, int], pattern: tuple[int, ...], directory: Path = PDB_DIRECTORY
+) -> Path:
+    """Return a path of a pattern database file, e.g. pdb/4x4_1-2-5-6-9.pdb"""
+    return (
+        directory
+        / f"{shape[0]}x{shape[1]}_{'-'.join(str(tile) for tile in pattern)}{PDB_SUFFIX}"
+    )
+
+
+def parse_pattern_path(path: Path) -> tuple[tuple[int, int], tuple[int, ...]]:
+    """Inverse of get_pattern_path, return a tuple (<shape>, <pattern>) for a pattern database file."""
+    shape_str, pattern_str = path.stem.split("_")
+    rows, columns = shape_str.split("x")
+    return (int(rows), int(columns)), tuple(
+        int(tile) for tile in pattern_str.split("-")
+    )
+
+
+def pattern_index(positions: list[int] | tuple[int, ...], n_cells: int) -> int:
+    """
+    Index of pattern tiles' positions in a pattern database table.
+
+    Positions are digits of the index in base n_cells, first tile being the least significant digit.
+    It wastes some space for impossible placements (tiles on the same cell), but can be updated with simple arithmetic.
+    """
+    index = 0
+    for position in reversed(positions):
+        index = index * n_cells + position
+    return index
+
+
+def generate_pattern_table(
+    shape: tuple[int, int], pattern: tuple[int, ...]
+) -> bytearray:
+    """
+    Generate a table of the lowest number of moves of pattern tiles required to put them in their target positions.
+
+    The table is built with retrograde breadth first search from the target State over abstract States consisting of
+    positions of pattern tiles and 0 tile, other tiles are indistinguishable. Only moves of pattern tiles are counted,
+    so tables of disjoint patterns can be added up and stay admissible. The search is a 0-1 BFS as moves of other tiles
+    are free. The table entry for pattern positions is the minimum over all positions of 0 tile.
+
+    :param shape: shape of the board
+    :param pattern: tiles of the pattern
+    :return: table of n_cells ** len(pattern) bytes indexed by pattern_index, UNVISITED for impossible placements
+    """
+    goal = get_goal(shape)
+    n_cells = shape[0] * shape[1]
+    n_tiles = len(pattern)
+    move_table = get_move_table(shape)
+    powers = [n_cells**i for i in range(n_tiles)]
+
+    table = bytearray([UNVISITED]) * (n_cells**n_tiles)
+    # Abstract State is encoded as pattern_index * n_cells + position of 0 tile
+    distances = bytearray([UNVISITED]) * (n_cells ** (n_tiles + 1))
+
+    start_positions = [
+        goal.coords[tile][0] * shape[1] + goal.coords[tile][1] for tile in pattern
+    ]
+    start = pattern_index(start_positions, n_cells) * n_cells + n_cells - 1
+    distances[start] = 0
+    frontier: deque[int] = deque([start])
+
+    while frontier:
+        encoded = frontier.popleft()
+        index, blank = divmod(encoded, n_cells)
+        distance = distances[encoded]
+        if distance < table[index]:
+            table[index] = distance
+
+        # {position: which tile of the pattern is there}
+        occupied: dict[int, int] = {}
+        rest = index
+        for slot in range(n_tiles):
+            rest, position = divmod(rest, n_cells)
+            occupied[position] = slot
+
+        for swap_with in move_table[blank].values():
+            if swap_with is None:
+                continue
+            slot = occupied.get(swap_with)
+            if slot is None:
+                # 0 tile swaps with a tile outside the pattern, which costs nothing
+                neighbor = index * n_cells + swap_with
+                if distances[neighbor] > distance:
+                    distances[neighbor] = distance
+                    frontier.appendleft(neighbor)
+            else:
+                # A pattern tile moves to the previous position of 0 tile
+                neighbor_index = index + (blank - swap_with) * powers[slot]
+                neighbor = neighbor_index * n_cells + swap_with
+                if distances[neighbor] > distance + 1:
+                    distances[neighbor] = distance + 1
+                    frontier.append(neighbor)
+    return table
+
+
+def save_pattern_table(table: bytearray, path: Path) -> None:
+    """Save a pattern table as a raw binary file, one byte per entry."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(table)
+
+
+class PatternDatabase:
+    """
+    Additive disjoint pattern database for a board of a given shape, loaded from pattern table files.
+
+    Tables are memory-mapped read-only, so all solver processes using the same files share one copy in memory.
+    """
+
+    def __init__(self, shape: tuple[int, int], directory: Path = PDB_DIRECTORY):
+        self.shape = shape
+        self.n_cells = shape[0] * shape[1]
+        self.patterns: list[tuple[int, ...]] = []
+        self.tables: list[mmap.mmap] = []
+        # {tile: (number of its pattern, its slot in the pattern)}
+        self.tile_slots: dict[int, tuple[int, int]] = {}
+
+        paths = sorted(directory.glob(f"{shape[0]}x{shape[1]}_*{PDB_SUFFIX}"))
+        if not paths:
+            logger.error(
+                f"No pattern databases for shape {shape} found in {directory}."
+            )
+            raise FileNotFoundError(
+                f"No pattern databases for shape {shape} found in {directory}. Generate them with: "
+                f"python program.py pdb {shape[0]}x{shape[1]}"
+            )
+        for path in paths:
+            _, pattern = parse_pattern_path(path)
+            for slot, tile in enumerate(pattern):
+                if tile in self.tile_slots:
+                    logger.error(f"Tile {tile} is in more than one pattern database.")
+                    raise ValueError(
+                        f"Pattern databases in {directory} are not disjoint, tile {tile} repeats."
+                    )
+                self.tile_slots[tile] = (len(self.patterns), slot)
+            with open(path, "rb") as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(table) != self.n_cells ** len(pattern):
+                logger.error(f"Pattern database {path} has unexpected size.")
+                raise ValueError(f"Pattern database {path} has unexpected size.")
+            self.patterns.append(pattern)
+            self.tables.append(table)
+        logger.info(f"Loaded pattern databases for shape {shape}: {self.patterns}")
+
+    def lookup(self, positions: list[int], pattern_number: int) -> int:
+        """Return a value for one pattern, positions being a list of positions of all tiles indexed by a tile."""
+        return self.tables[pattern_number][
+            pattern_index(
+                [positions[tile] for tile in self.patterns[pattern_number]],
+                self.n_cells,
+            )
+        ]
+
+    def evaluate(self, positions: list[int]) -> int:
+        """Return a sum of values for all patterns, positions being a list of positions of all tiles indexed by a tile."""
+        return sum(
+            self.lookup(positions, pattern_number)
+            for pattern_number in range(len(self.patterns))
+        )
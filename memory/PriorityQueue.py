@@ -0,0 +1,75 @@
+import heapq
+import itertools
+from typing import Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Stale heap entries are dropped once there are more of them than live ones and this many
+MIN_STALE_ENTRIES: int = 1024
+
+
+class PriorityQueue(Generic[T]):
+    """
+    A binary heap priority queue with O(1) membership tests, used as an open list in informed searches.
+
+    Items with equal priority are popped in the order they were pushed (first inserted wins).
+    Items are indexed by a key (e.g. hash of a State). Removing a key or pushing it again with a new priority
+    leaves its old heap entry in place, such stale entries are skipped when popping (lazy deletion)
+    and dropped all at once when they outnumber live entries, so the heap stays O(len(queue)).
+    """
+
+    def __init__(self):
+        # (priority, insertion number, key)
+        self._heap: list[tuple[int | float, int, int]] = []
+        self._entries: dict[int, tuple[int, T]] = {}  # {key: (insertion number, item)}
+        self._counter = itertools.count()
+
+    def push(self, key: int, item: T, priority: int | float) -> None:
+        """Add an item under a key, or replace an item and its priority if a key is already in the queue."""
+        insertion_number = next(self._counter)
+        self._entries[key] = (insertion_number, item)
+        heapq.heappush(self._heap, (priority, insertion_number, key))
+        if len(self._heap) > 2 * len(self._entries) + MIN_STALE_ENTRIES:
+            self._compact()
+
+    def pop(self) -> tuple[int, T]:
+        """
+        Remove and return an item with the lowest priority as a tuple (<key>, <item>).
+
+        :raise IndexError: If the queue is empty.
+        """
+        while self._heap:
+            _, insertion_number, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            # Skip stale heap entries of removed or re-pushed keys
+            if entry is not None and entry[0] == insertion_number:
+                del self._entries[key]
+                return key, entry[1]
+        raise IndexError("pop from an empty priority queue")
+
+    def remove(self, key: int) -> T:
+        """Remove an item from the queue and return it. Its heap entry is discarded lazily."""
+        return self._entries.pop(key)[1]
+
+    def get(self, key: int) -> T | None:
+        """Return an item stored under a key or None if the key is not in the queue."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def _compact(self) -> None:
+        """Drop stale heap entries of removed and re-pushed keys."""
+        self._heap = [
+            (priority, insertion_number, key)
+            for priority, insertion_number, key in self._heap
+            if key in self._entries and self._entries[key][0] == insertion_number
+        ]
+        heapq.heapify(self._heap)
+
+    def keys(self) -> Iterator[int]:
+        return iter(self._entries.keys())
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,111 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from memory.Board import BITS_PER_TILE, MAX_CELLS, TILE_MASK, pack_tiles
+
+DEFAULT_MAX_ENTRIES: int = 100_000
+
+
+@dataclass
+class CachedSolution:
+    """A solution found by an algorithm with stats of the search which found it."""
+
+    moves: str | None  # None if the algorithm hasn't found a solution
+    visited: int
+    explored: int
+    max_depth: int
+
+
+def board_key(array: np.ndarray) -> str:
+    """
+    Return a key of a board: its shape and the board packed with pack_tiles in hex, e.g. 4x4:fedcba987654321,
+    or all tiles if the board doesn't fit in 64 bits.
+    """
+    rows, columns = array.shape
+    tiles = [int(tile) for tile in array.flat]
+    if len(tiles) <= MAX_CELLS and max(tiles) <= TILE_MASK:
+        hex_digits = len(tiles) * BITS_PER_TILE // 4
+        return f"{rows}x{columns}:{pack_tiles(tiles):0{hex_digits}x}"
+    return f"{rows}x{columns}:{'-'.join(str(tile) for tile in tiles)}"
+
+
+class SolutionCache:
+    """
+    Solutions of boards by strategy and its param, stored in an SQLite file, so that they are shared between runs.
+
+    When there are more than max_entries solutions, the least recently used ones are evicted.
+    Many processes can use one file at once, SQLite locks it for writing.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(path, timeout=30.0)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS solutions (
+                    board TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    param TEXT NOT NULL,
+                    moves TEXT,
+                    visited INTEGER NOT NULL,
+                    explored INTEGER NOT NULL,
+                    max_depth INTEGER NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (board, strategy, param)
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+            )
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def get(self, board: str, strategy: str, param: str) -> CachedSolution | None:
+        """Return a cached solution and mark it as recently used, or None if there is none."""
+        with self._connection:
+            row = self._connection.execute(
+                "SELECT moves, visited, explored, max_depth FROM solutions "
+                "WHERE board = ? AND strategy = ? AND param = ?",
+                (board, strategy, param),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE solutions SET last_used = ? WHERE board = ? AND strategy = ? AND param = ?",
+                (time.time_ns(), board, strategy, param),
+            )
+        return CachedSolution(*row)
+
+    def put(
+        self, board: str, strategy: str, param: str, solution: CachedSolution
+    ) -> None:
+        """Store a solution, evicting the least recently used solutions if the cache is full."""
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    board,
+                    strategy,
+                    param,
+                    solution.moves,
+                    solution.visited,
+                    solution.explored,
+                    solution.max_depth,
+                    time.time_ns(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM solutions WHERE rowid IN "
+                "(SELECT rowid FROM solutions ORDER BY last_used "
+                "LIMIT max((SELECT COUNT(*) FROM solutions) - ?, 0))",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
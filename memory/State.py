@@ -1,30 +1,45 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Literal, Optional, TypeAlias
+from typing import Literal, Optional, TypeAlias
 
 # noinspection Mypy
 import numpy as np
 from loguru import logger
 
-from Exception import InvalidCoordinatesException
+from Exception import InvalidBoardException, InvalidCoordinatesException
+from memory.Board import get_goal, get_move_table
 
 DIRECTION: TypeAlias = Literal["left", "right", "up", "down"]
 
+DIRECTIONS_STR_MAPPING: dict[str, DIRECTION] = {
+    "L": "left",
+    "R": "right",
+    "U": "up",
+    "D": "down",
+}
+# Letters of moves which undo each other, e.g. moving 0 left right after moving it right
+OPPOSITE_MOVES: dict[str, str] = {"L": "R", "R": "L", "U": "D", "D": "U"}
+
 
 @dataclass
 class State:
     array: np.ndarray
-    heuristic_value: int | None = None
+    heuristic_value: int | float | None = None
     parent: Optional["State"] = None
     preceding_operator: DIRECTION | None = None
+    h_value: int | None = None  # h(n) of a heuristic used to find the State
+    # Coords of 0 tile, found once for an initial State and derived from a move for its children
+    blank: tuple[int, int] | None = field(default=None, repr=False, compare=False)
+    # Number of moves from the initial State, derived from the parent's depth
+    depth: int | None = field(default=None, compare=False)
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.operations_str_mapping: dict[str, Callable] = {
-            "L": self.left,
-            "R": self.right,
-            "U": self.up,
-            "D": self.down,
-        }
+        if self.blank is None:
+            a, b = np.where(self.array == 0)
+            self.blank = int(a[0]), int(b[0])  # Explicit casting for mypy
+        if self.depth is None:
+            self.depth = 0 if self.parent is None else self.parent.depth + 1
 
     @property
     def target_state(self):
@@ -38,31 +53,98 @@ class State:
         :param filepath: Path to txt file the with initial State
         :return: A loaded State or None if the operation failed.
         :raise IOError: If a file doesn't exist or cannot be accessed.
+        :raise InvalidBoardException: If a board doesn't match its header or doesn't have all tiles exactly once.
         """
         filepath_ = Path(filepath)
         try:
             with open(filepath_, "r") as f:
-                # Get rid of 1st line, which is size
-                (
-                    _,
-                    *output_str,
-                ) = f.readlines()  # ['1 2 3 4', '5 6 7 8', '9 10 11 12', '13 14 15 0']
-                output_list_str: list[list[str]] = [
-                    line.strip("\n").split(sep=" ") for line in output_str
-                ]
-                # [[ '1',  '2',  '3',  '4'],
-                #  [ '5',  '6',  '7',  '8'],
-                #  [ '9', '10', '11', '12'],
-                #  ['13', '14', '15',  '0']]
-                array_of_str = np.array(output_list_str)
-                array_of_int = array_of_str.astype(np.int32)
-                return State(
-                    array=array_of_int,
-                    parent=None,
-                )
+                # ['4 4', '1 2 3 4', '5 6 7 8', '9 10 11 12', '13 14 15 0']
+                lines = f.readlines()
         except IOError as e:
             logger.error(e)
             raise e
+        return State.from_lines(lines, str(filepath))
+
+    @staticmethod
+    def from_lines(lines: list[str], source: str = "input") -> "State":
+        """
+        Create an initial State from lines in the format of puzzle files: a header with the size (<rows> <columns>)
+        followed by rows of tiles separated with spaces.
+
+        :param lines: lines of a puzzle
+        :param source: where the lines come from, for error messages
+        :raise InvalidBoardException: If a board doesn't match its header or doesn't have all tiles exactly once.
+        """
+        if not lines:
+            logger.error(f"{source} is empty.")
+            raise InvalidBoardException(f"{source} is empty.")
+        # 1st line is size: <rows> <columns>
+        header, *output_str = lines
+        try:
+            shape = tuple(int(size) for size in header.split())
+            # [[ 1,  2,  3,  4],
+            #  [ 5,  6,  7,  8],
+            #  [ 9, 10, 11, 12],
+            #  [13, 14, 15,  0]]
+            output_list_int: list[list[int]] = [
+                [int(tile) for tile in line.split()]
+                for line in output_str
+                if line.strip()
+            ]
+        except ValueError:
+            logger.error(f"{source} contains something else than numbers.")
+            raise InvalidBoardException(
+                f"{source} contains something else than numbers."
+            )
+        State._validate_board(output_list_int, shape)
+        return State(
+            array=np.array(output_list_int, dtype=np.int32),
+            parent=None,
+        )
+
+    @staticmethod
+    def from_rows(rows: list[list[int]]) -> "State":
+        """
+        Create an initial State from rows of tiles, e.g. [[1, 2, 3], [4, 5, 6], [7, 8, 0]].
+
+        :raise InvalidBoardException: If rows aren't of equal length or don't have all tiles exactly once.
+        """
+        if not rows or not all(isinstance(tile, int) for row in rows for tile in row):
+            logger.error(f"Invalid board: {rows}.")
+            raise InvalidBoardException(f"Invalid board: {rows}.")
+        State._validate_board(rows, (len(rows), len(rows[0])))
+        return State(array=np.array(rows, dtype=np.int32), parent=None)
+
+    @staticmethod
+    def _validate_board(rows: list[list[int]], shape: tuple[int, ...]) -> None:
+        """
+        Check if rows of tiles loaded from a file make a board of a given shape with each tile 0...n-1 exactly once.
+
+        :raise InvalidBoardException: If they don't.
+        """
+        if (
+            len(shape) != 2
+            or len(rows) != shape[0]
+            or any(len(row) != shape[1] for row in rows)
+        ):
+            logger.error(
+                f"Board of {len(rows)} rows of lengths {[len(row) for row in rows]} doesn't match shape {shape}."
+            )
+            raise InvalidBoardException(
+                f"Board of {len(rows)} rows of lengths {[len(row) for row in rows]} doesn't match shape {shape}."
+            )
+        tiles = [tile for row in rows for tile in row]
+        expected = set(range(len(tiles)))
+        duplicated = sorted({tile for tile in tiles if tiles.count(tile) > 1})
+        missing = sorted(expected - set(tiles))
+        unexpected = sorted(set(tiles) - expected)
+        if duplicated or missing or unexpected:
+            logger.error(
+                f"Invalid tiles, duplicated: {duplicated}, missing: {missing}, out of range: {unexpected}."
+            )
+            raise InvalidBoardException(
+                f"Invalid tiles, duplicated: {duplicated}, missing: {missing}, out of range: {unexpected}."
+            )
 
     def get_state_shape(self) -> tuple[int, int]:
         """Return array's dimensions."""
@@ -86,8 +168,7 @@ class State:
 
     def _find_zero(self) -> tuple[int, int]:
         """Return zero-based coordinates for 0 tile as a tuple (<row>, <column>)"""
-        a, b = np.where(self.array == 0)
-        return int(a), int(b)  # Explicit casting for mypy
+        return self.blank
 
     @staticmethod
     def _sum_tuples(first: tuple[int, int], second: tuple[int, int]):
@@ -123,6 +204,15 @@ class State:
             logger.error(f"Coords for tile {tile} not found.")
             return None
 
+    def get_moved_tile(self) -> tuple[int, tuple[int, int], tuple[int, int]]:
+        """
+        Return a tile moved by the preceding operator as a tuple (<tile>, <coords before move>, <coords after move>).
+
+        The tile took the place of 0 tile in the parent State, and 0 tile took its place.
+        """
+        to_coords: tuple[int, int] = self.parent._find_zero()
+        return int(self.array[to_coords]), self._find_zero(), to_coords
+
     def _check_legal_move(self, change: tuple[int, int]) -> bool:
         """Returns True if the operation up | down | left | right is valid else False"""
         zero_coords: tuple[int, int] = self._find_zero()
@@ -186,11 +276,12 @@ class State:
                 self._find_zero(), direction_coords
             )
             new_state_array: np.ndarray = self._swap_values(new_coords)
-            logger.debug(
-                f"_move executed with direction={direction}, direction_coords={direction_coords}, new_coords={new_coords}, new_state_array=\n{new_state_array}"
-            )
+            # 0 tile is now where the swapped tile was, so there's no need to look for it in the new array
             return State(
-                array=new_state_array, parent=self, preceding_operator=direction
+                array=new_state_array,
+                parent=self,
+                preceding_operator=direction,
+                blank=new_coords,
             )
         else:
             logger.debug(
@@ -200,63 +291,63 @@ class State:
 
     def get_neighbors(self, neighbors_query_order: str = "LRUD") -> list["State"]:
         available_moves: list[State] = []
+        # Legal moves for the current position of 0 tile, e.g. {"left": None, "right": 7, "up": 2, "down": 10}
+        legal_moves = get_move_table(self.array.shape)[
+            self.blank[0] * self.array.shape[1] + self.blank[1]
+        ]
         for direction in neighbors_query_order:
-            if available := self.operations_str_mapping[
-                direction
-            ]():  # iterate over neighbors_query_order and call function mapped to direction, e.g. {"U": self.up()}
-                available_moves.append(available)
+            # iterate over neighbors_query_order and move 0 in a direction mapped to a letter, e.g. {"U": "up"}
+            # skipping illegal moves without even trying them
+            if legal_moves[DIRECTIONS_STR_MAPPING[direction]] is not None:
+                available_moves.append(self._move(DIRECTIONS_STR_MAPPING[direction]))
         return available_moves
 
     def _generate_target_state(self) -> "State":
         """
         Method to create a target State (i.e. a 2D array with consecutive numbers 1...n-1 and 0 at the end) based on object's array.
 
+        The target array is cached per array shape (see memory.Board.get_goal), so this doesn't allocate a new array.
+
         An example target state for 4x4 array:
         [[ 1,  2,  3,  4],
          [ 5,  6,  7,  8],
          [ 9, 10, 11, 12],
          [13, 14, 15,  0]]
         """
-        num_range = len(self.array.flat)  # how many numbers are
-        target_state = np.arange(
-            1, num_range + 1
-        )  # first create a 1D array 1...n (n is length of a flattened array we compare with)
-        target_state[
-            num_range - 1
-        ] = 0  # replace last value with 0 symbolising an empty tile
-        target_state = target_state.reshape(
-            self.array.shape
-        )  # reshape the 1D array of consecutive numbers with 0 at the end to match the shape of array we compare with
-        return State(array=target_state)
+        return State(array=get_goal(self.array.shape).array)
 
     def is_target_state(self) -> bool:
-        return self == self.target_state
+        """Check if a State is the target State comparing its hash with a cached hash of the target State."""
+        goal = get_goal(self.array.shape)
+        # Arrays are only compared on a hash match, i.e. almost only for the actual target State
+        return (
+            hash(self) == goal.get_hash(self.array.dtype)
+            and (self.array == goal.array).all()
+        )
 
     def get_path_to_state(self, path_to_state: list[str] = None) -> str:
         """Get a list of operations required to reach a current State from the first State (i.e. State without a parent)"""
         if path_to_state is None:
             path_to_state = []
-        if (
-            self.preceding_operator is None
-        ):  # If node doesn't have a parent it means it's the root (initial) node,which signals end of recursion
-            path_to_state.reverse()  # Because moves are listed last to first, and we want first to last
-            return "".join(path_to_state)
-        else:
-            path_to_state.append(self.preceding_operator[0].upper())
-            return self.parent.get_path_to_state(path_to_state)
+        # Follow parents in a loop, a recursive walk hits the recursion limit on deep paths
+        state = self
+        while (
+            state.preceding_operator is not None
+        ):  # If node doesn't have a parent it means it's the root (initial) node
+            path_to_state.append(state.preceding_operator[0].upper())
+            state = state.parent
+        path_to_state.reverse()  # Because moves are listed last to first, and we want first to last
+        return "".join(path_to_state)
 
     def get_state_depth(self) -> int:
         """Get State's depth."""
-        if (
-            self.parent is None
-        ):  # If node doesn't have a parent it means it's the root (initial) node,which signals end of recursion
-            return 0
-        else:
-            return self.parent.get_state_depth() + 1
+        return self.depth
 
     def __hash__(self) -> int:
-        """We hash a state only by its array"""
-        return hash(self.array.tobytes())
+        """We hash a state only by its array. States are never modified in place, so the hash is computed once."""
+        if self._hash is None:
+            self._hash = hash(self.array.tobytes())
+        return self._hash
 
     def __eq__(self, other) -> bool:
         """We compare states only by comparing arrays"""
@@ -281,4 +372,5 @@ class State:
         return State(
             array=self.array.copy(),
             parent=self.parent,  # This in only referenced, not copied
+            blank=self.blank,
         )
@@ -0,0 +1,86 @@
+import numpy as np
+
+from memory.Board import get_goal
+
+# Moves of 0 tile on a board reflected across the main diagonal
+TRANSPOSED_MOVES: dict[str, str] = {"L": "U", "U": "L", "R": "D", "D": "R"}
+_TRANSPOSED_MOVES_TABLE = str.maketrans(TRANSPOSED_MOVES)
+
+# {size of a square board: tile placed by the transposition where a tile (index) was}
+_RELABELINGS: dict[int, np.ndarray] = {}
+
+
+def transpose_moves(moves: str) -> str:
+    """Translate moves solving a board into moves solving its transposed board (and the other way round)."""
+    return moves.translate(_TRANSPOSED_MOVES_TABLE)
+
+
+def _get_relabeling(size: int) -> np.ndarray:
+    """
+    Return (and cache) relabeling of tiles: a tile is replaced by the tile whose target position is the transposed
+    target position of the tile. 0 tile stays 0, as its target position is on the diagonal.
+    """
+    if size not in _RELABELINGS:
+        goal = get_goal((size, size))
+        relabeling = np.zeros(size * size, dtype=np.int64)
+        for tile, (row, column) in enumerate(goal.coords):
+            relabeling[tile] = goal.array[column, row]
+        _RELABELINGS[size] = relabeling
+    return _RELABELINGS[size]
+
+
+def is_symmetric(shape: tuple[int, int]) -> bool:
+    """Only square boards are symmetric with respect to their main diagonal."""
+    return shape[0] == shape[1]
+
+
+def transpose_board(array: np.ndarray) -> np.ndarray:
+    """
+    Reflect a square board across its main diagonal and relabel tiles, so that the target board maps to itself.
+
+    A board and its transposed board need the same number of moves, moving 0 tile left on one of them is moving it up
+    on the other (see transpose_moves).
+    """
+    return _get_relabeling(array.shape[0])[array.T]
+
+
+def canonicalize(array: np.ndarray) -> tuple[np.ndarray, bool]:
+    """
+    Return the canonical board of a board's symmetry class (the lower of a board and its transposed board, compared
+    tile by tile) and if it is the transposed one. Non-square boards are their own canonical boards.
+    """
+    if not is_symmetric(array.shape):
+        return array, False
+    transposed = transpose_board(array)
+    if transposed.flatten().tolist() < array.flatten().tolist():
+        return transposed, True
+    return array, False
+
+
+def transpose_param(strategy_param: str) -> str | None:
+    """
+    Translate a Strategy_param which is a query order, e.g. "LRUD:limit=30" -> "ULDR:limit=30". An algorithm with
+    the translated order does on a transposed board exactly what it does with the original order on the original one.
+
+    :return: translated Strategy_param or None if the param isn't a query order
+    """
+    order, separator, options = strategy_param.partition(":")
+    if sorted(order) != sorted("LRUD"):
+        return None
+    return transpose_moves(order) + separator + options
+
+
+def transpose_positions(positions: list[int], size: int) -> list[int]:
+    """
+    Transpose a board given as flat positions of tiles indexed by a tile, like transpose_board does with an array.
+
+    :param positions: flat (row-major) positions of all tiles on a square board, indexed by a tile
+    :param size: number of rows (and columns) of the board
+    :return: positions of all tiles on the transposed board, indexed by a tile
+    """
+    relabeling = _get_relabeling(size).tolist()
+    transposed = [0] * len(positions)
+    for tile, position in enumerate(positions):
+        row, column = divmod(position, size)
+        transposed[relabeling[tile]] = column * size + row
+    return transposed
@@ -1,38 +1,102 @@
 import argparse
 import datetime
+import inspect
 import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing.io import TextIO
 
 from loguru import logger
 
+from algorithms.ARAStar import AnytimeSolution, ARAStar
 from algorithms.AStar import AStar
+from algorithms.BaseAlgorithm import BaseAlgorithm
 from algorithms.BFS import BFS
+from algorithms.BidirectionalBFS import BidirectionalBFS
+from algorithms.CachedAlgorithm import CachedAlgorithm
 from algorithms.DFS import DFS
+from algorithms.IDDFS import IDDFS
+from algorithms.IDAStar import IDAStar
+from algorithms.LayeredBFS import LayeredBFS
+from algorithms.Profiler import PROFILE_TOOLS, Profiler
+from algorithms.SMAStar import SMAStar
+from Exception import InvalidBoardException, UnsolvableBoardException
+from memory.Board import is_solvable
+from memory.PackedState import PackedState
+from memory.PatternDatabase import (
+    DEFAULT_PATTERNS,
+    PDB_DIRECTORY,
+    generate_pattern_table,
+    get_pattern_path,
+    save_pattern_table,
+)
+from memory.SolutionCache import DEFAULT_MAX_ENTRIES, SolutionCache
 from memory.State import State
 
-# Write logs from program execution to a file
-logger.add(
-    Path("logs/program_exec_info.log"),
-    retention="1 day",
-    format="{elapsed} {level} {line}: {module}.{function}: {message}",
-    level="INFO",
-)
-# And show error logs in STDERR
-logger.add(sys.stderr, format="{elapsed} {level} {function} {message}", level="ERROR")
-logger.remove(0)  # remove the default DEBUG logger
+# {Strategy: algorithm class initialised with Strategy_param}
+ALGORITHMS: dict[str, type[BaseAlgorithm]] = {
+    "bfs": BFS,
+    "bibfs": BidirectionalBFS,
+    "lbfs": LayeredBFS,
+    "dfs": DFS,
+    "iddfs": IDDFS,
+    "astr": AStar,
+    "idastr": IDAStar,
+    "smastr": SMAStar,
+    "arastr": ARAStar,
+}
+
+
+def configure_logging() -> None:
+    """Set up program's log sinks. Called by main, so that importing this module doesn't add any."""
+    logger.remove()  # remove the default DEBUG logger (and sinks added by a parent process)
+    # Write logs from program execution to a file
+    logger.add(
+        Path("logs/program_exec_info.log"),
+        retention="1 day",
+        format="{elapsed} {level} {line}: {module}.{function}: {message}",
+        level="INFO",
+    )
+    # And show error logs in STDERR
+    logger.add(
+        sys.stderr, format="{elapsed} {level} {function} {message}", level="ERROR"
+    )
+
+
+def enable_trace_logging() -> None:
+    """Make the algorithms log every examined State and add a sink for these logs."""
+    BaseAlgorithm.trace = True
+    logger.add(
+        Path("logs/program_exec_trace.log"),
+        retention="1 day",
+        format="{elapsed} {level} {line}: {module}.{function}: {message}",
+        level="TRACE",
+    )
 
 
 def main() -> None:
+    configure_logging()
+
+    # Other commands than solving a single puzzle, e.g. python program.py pdb 4x4
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     # Program arguments
     # Example: python program.py bfs RDUL 4x4_01_0001.txt 4x4_01_0001_bfs_rdul_sol.txt 4x4_01_0001_bfs_rdul_stats.txt
     parser = argparse.ArgumentParser()
-    parser.add_argument("Strategy", type=str, help="Algorithm [bfs, dfs, astr]")
+    parser.add_argument(
+        "Strategy",
+        type=str,
+        choices=ALGORITHMS.keys(),
+        help="Algorithm [bfs, bibfs, lbfs, dfs, iddfs, astr, idastr, smastr, arastr]",
+    )
     parser.add_argument(
         "Strategy_param",
         type=str,
-        help="For bfs or dfs: any permutation of: LRUD; For astr: hamm | manh",
+        help="For bfs, bibfs, lbfs, dfs or iddfs: any permutation of: LRUD; For astr, idastr, smastr or arastr: hamm | manh | lc | wd | pdb. "
+        "Options follow as :NAME=VALUE, e.g. LRUD:limit=30 sets the depth limit of dfs and iddfs, manh:w=2.0 the weight of astr",
     )
     parser.add_argument("Input_file", type=str, help="Input puzzle .txt file")
     parser.add_argument(
@@ -43,7 +107,78 @@ def main() -> None:
     parser.add_argument(
         "Output_Stats", type=str, help="Output .txt file with algorithm statistics"
     )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Keep boards packed in a single integer (up to 4x4) instead of a numpy array",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Log every examined State to logs/program_exec_trace.log (very slow)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite file with cached solutions, a cached solution is used instead of searching",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Maximum number of cached solutions, the least recently used are evicted (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Stop the search after expanding this many States",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Stop the search when the process uses this much memory (MB)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Stop the search after this many seconds",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="phases",
+        choices=("phases", *PROFILE_TOOLS),
+        default=None,
+        help="Count calls and measure time of search phases and write a JSON report next to the stats file "
+        "(<stats>.profile.json), optionally also profiling the run with cprofile or tracemalloc",
+    )
     args = parser.parse_args()
+    if args.trace:
+        enable_trace_logging()
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler(None if args.profile == "phases" else args.profile)
+
+    try:
+        algorithm = create_algorithm(
+            args.Strategy,
+            args.Strategy_param,
+            args.max_nodes,
+            args.max_memory_mb,
+            args.timeout,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    cache = None
+    if args.cache is not None:
+        cache = SolutionCache(args.cache, args.cache_size)
+        algorithm = CachedAlgorithm(
+            algorithm, args.Strategy, args.Strategy_param, cache
+        )
 
     # Output files
     solution_file = prepare_file("./" + args.Output_Solution)
@@ -52,20 +187,145 @@ def main() -> None:
     # Input file path
     input_file_path = os.path.realpath("./" + args.Input_file)
 
-    if args.Strategy == "bfs":
-        bfs = BFS(args.Strategy_param)
-        solve_puzzle(bfs, input_file_path, solution_file, stats_file)
+    # State representation used by the algorithms
+    state_type = PackedState if args.packed else State
+
+    try:
+        with profiler.profile(algorithm) if profiler is not None else nullcontext():
+            solve_puzzle(
+                algorithm, input_file_path, solution_file, stats_file, state_type
+            )
+    except (InvalidBoardException, UnsolvableBoardException):
+        pass  # already logged, for an unsolvable puzzle -1 is written to the output files
+    finally:
+        solution_file.close()
+        stats_file.close()
+        if cache is not None:
+            cache.close()
+    if profiler is not None:
+        profiler.write_report(
+            stats_file.name,
+            strategy=args.Strategy,
+            strategy_param=args.Strategy_param,
+            input_file=args.Input_file,
+            packed=args.packed,
+        )
+
+
+def generate_pattern_databases(argv: list[str]) -> None:
+    """Generate pattern database files used by pdb heuristic."""
+    # Example: python program.py pdb 4x4 --pattern 1,2,5,6,9 --pattern 3,4,7,8,11 --pattern 10,12,13,14,15
+    parser = argparse.ArgumentParser(prog="program.py pdb")
+    parser.add_argument("Shape", type=str, help="Board shape, e.g. 4x4")
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        action="append",
+        help="Comma separated tiles of a pattern, repeat for each pattern (default partition for a shape if omitted)",
+    )
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=PDB_DIRECTORY,
+        help=f"Output directory (default: {PDB_DIRECTORY})",
+    )
+    args = parser.parse_args(argv)
+
+    rows, columns = args.Shape.split("x")
+    shape = (int(rows), int(columns))
+    if args.pattern:
+        patterns = [
+            tuple(int(tile) for tile in pattern.split(",")) for pattern in args.pattern
+        ]
+    elif shape in DEFAULT_PATTERNS:
+        patterns = DEFAULT_PATTERNS[shape]
+    else:
+        parser.error(f"No default patterns for shape {args.Shape}, use --pattern.")
+
+    for pattern in patterns:
+        path = get_pattern_path(shape, pattern, args.directory)
+        start_time = datetime.datetime.now()
+        save_pattern_table(generate_pattern_table(shape, pattern), path)
+        time_in_s = (datetime.datetime.now() - start_time).total_seconds()
+        logger.info(f"Generated {path} in {time_in_s:.1f}s")
+        print(f"{path} ({time_in_s:.1f}s)")
+
+
+def run_batch(argv: list[str]) -> None:
+    """Solve many puzzles with many strategies in parallel processes, see batch.py."""
+    # batch imports this module, so it can only be imported once this module is loaded
+    from batch import main as batch_main
+
+    batch_main(argv)
+
 
-    elif args.Strategy == "dfs":
-        dfs = DFS(args.Strategy_param)
-        solve_puzzle(dfs, input_file_path, solution_file, stats_file)
+def run_stream(argv: list[str]) -> None:
+    """Solve puzzles read from STDIN in a single process, writing results to STDOUT, see stream.py."""
+    # stream imports this module, so it can only be imported once this module is loaded
+    from stream import main as stream_main
 
-    elif args.Strategy == "astr":
-        astr = AStar(args.Strategy_param)
-        solve_puzzle(astr, input_file_path, solution_file, stats_file)
+    stream_main(argv)
 
-    solution_file.close()
-    stats_file.close()
+
+def run_server(argv: list[str]) -> None:
+    """Serve puzzle solving over HTTP on localhost with a pool of worker processes, see server.py."""
+    # server imports this module, so it can only be imported once this module is loaded
+    from server import main as server_main
+
+    server_main(argv)
+
+
+def parse_strategy_param(
+    strategy_param: str,
+) -> tuple[str, dict[str, int | float | str]]:
+    """
+    Split Strategy_param into the parameter and options given after it as :NAME=VALUE.
+
+    parse_strategy_param("LRUD") -> ("LRUD", {})
+    parse_strategy_param("LRUD:limit=30") -> ("LRUD", {"limit": 30})
+    """
+    param, *options_str = strategy_param.split(":")
+    options: dict[str, int | float | str] = {}
+    for option in options_str:
+        name, separator, value = option.partition("=")
+        if not name or not separator:
+            logger.error(f"Invalid option: {option}.")
+            raise ValueError(f"Invalid option: {option}, expected NAME=VALUE.")
+        for value_type in (int, float):
+            try:
+                options[name] = value_type(value)
+                break
+            except ValueError:
+                pass
+        else:
+            options[name] = value
+    return param, options
+
+
+def create_algorithm(
+    strategy: str,
+    strategy_param: str,
+    max_nodes: int | None = None,
+    max_memory_mb: float | None = None,
+    timeout_s: float | None = None,
+) -> BaseAlgorithm:
+    """
+    Create an algorithm for a Strategy name and its parameter with options, e.g. ("dfs", "LRUD:limit=30"),
+    with budgets of its searches (see BaseAlgorithm), None for no limit.
+    """
+    if strategy not in ALGORITHMS:
+        logger.error(f"Unsupported strategy: {strategy}.")
+        raise ValueError(f"Unsupported strategy: {strategy}.")
+    param, options = parse_strategy_param(strategy_param)
+    algorithm_parameters = inspect.signature(ALGORITHMS[strategy]).parameters
+    if unsupported := [name for name in options if name not in algorithm_parameters]:
+        logger.error(f"Unsupported options for {strategy}: {unsupported}.")
+        raise ValueError(f"Unsupported options for {strategy}: {unsupported}.")
+    algorithm = ALGORITHMS[strategy](param, **options)
+    algorithm.max_nodes = max_nodes
+    algorithm.max_memory_mb = max_memory_mb
+    algorithm.timeout_s = timeout_s
+    return algorithm
 
 
 def prepare_file(file_path: str) -> TextIO:
@@ -88,14 +348,52 @@ def write_to_stats_file(
     recursion: int,
     time_elapsed: float,
     stats_file,
+    cache_hit: bool | None = None,
 ) -> None:
     stats_file.write(
         f"{n_moves}\n{visited}\n{explored}\n{recursion}\n{format(time_elapsed, '.3f')}\n"
     )
+    # With a solution cache a 6th line tells if the solution came from it (1) or from a search (0)
+    if cache_hit is not None:
+        stats_file.write(f"{int(cache_hit)}\n")
 
 
-def solve_puzzle(algorithm, input_file_path, output_solution, output_stats):
-    state = State.load_state(input_file_path)
+def get_anytime_solutions(algorithm: BaseAlgorithm) -> list[AnytimeSolution] | None:
+    """Return solutions found by an anytime search (also one wrapped in a cache), None for other algorithms."""
+    if isinstance(algorithm, CachedAlgorithm):
+        algorithm = algorithm.algorithm
+    return algorithm.solutions if isinstance(algorithm, ARAStar) else None
+
+
+def write_anytime_solutions(solutions: list[AnytimeSolution], stats_file) -> None:
+    # After the standard lines, each improved solution of an anytime search: "<n_moves> <w> <time in ms>"
+    for solution in solutions:
+        stats_file.write(
+            f"{solution.n_moves} {solution.w} {format(solution.time_ms, '.3f')}\n"
+        )
+
+
+def solve_puzzle(
+    algorithm, input_file_path, output_solution, output_stats, state_type=State
+) -> tuple[str | None, float]:
+    """
+    Solve a puzzle from a file, write solution and stats files and return a tuple (<moves>, <time in ms>).
+
+    :raise InvalidBoardException: If a puzzle file is malformed, nothing is written then.
+    :raise UnsolvableBoardException: If a puzzle can't be solved. It's checked before running the algorithm,
+                                     -1 is written to the solution file and to stats with zero visited States.
+
+    If the search exceeds a budget of the algorithm, -1 is written with the stats gathered until it was stopped
+    and algorithm.stop_reason tells which budget it was.
+    """
+    state = state_type.load_state(input_file_path)
+    if not is_solvable(
+        [int(tile) for tile in state.array.flat], state.get_state_shape()
+    ):
+        logger.error(f"Puzzle {input_file_path} is unsolvable.")
+        write_to_solution_file(None, output_solution)
+        write_to_stats_file(-1, 0, 0, 0, 0.0, output_stats)
+        raise UnsolvableBoardException(f"Puzzle {input_file_path} is unsolvable.")
     # Start time marker
     start_time = datetime.datetime.now()
     # Run algorithm to solve the puzzle
@@ -113,12 +411,25 @@ def solve_puzzle(algorithm, input_file_path, output_solution, output_stats):
     write_to_stats_file(
         n_moves,
         algorithm.visited_states,
-        len(algorithm.closed_list),
+        algorithm.explored_states,
         algorithm.max_depth,
         time_in_ms,
         output_stats,
+        algorithm.cache_hit if isinstance(algorithm, CachedAlgorithm) else None,
     )
+    solutions = get_anytime_solutions(algorithm)
+    if solutions is not None:
+        write_anytime_solutions(solutions, output_stats)
+    return moves, time_in_ms
+
 
+# {command name: function taking the rest of command line arguments}
+COMMANDS = {
+    "pdb": generate_pattern_databases,
+    "batch": run_batch,
+    "stream": run_stream,
+    "serve": run_server,
+}
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+from loguru import logger
+
+from Exception import BoardTooLargeException, InvalidBoardException
+from memory.PackedState import PackedState
+from memory.State import State
+from program import configure_logging, create_algorithm
+from batch import hard_time_limit
+from stream import solve_board
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8080
+DEFAULT_TIMEOUT: float = 30.0
+DEFAULT_MAX_NODES: int = 10_000_000
+MAX_BODY_SIZE: int = 1 << 20
+# Upper bounds of histogram buckets in milliseconds, the last bucket (+Inf) takes everything above
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+
+class RequestError(Exception):
+    """An invalid request, answered with an HTTP error status and a message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Histogram:
+    """Counts of observed values in buckets with fixed upper bounds, like Prometheus histograms."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        """Return cumulative counts of values up to each bucket bound ("le"), their number and sum."""
+        cumulative, total = {}, 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        return {"le": cumulative, "count": total, "sum": round(self.sum, 3)}
+
+
+class Metrics:
+    """Throughput and latency of a server since it was started."""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.in_flight: int = 0
+        self.responses: dict[int, int] = {}  # {HTTP status: number of responses}
+        self.results: dict[str, int] = {}  # {status of a solve: number of solves}
+        # Whole /solve requests, including waiting for a worker
+        self.latency = Histogram()
+        self.solve_time = Histogram()  # searches in workers
+
+    def observe_response(self, status: int, latency_ms: float) -> None:
+        self.responses[status] = self.responses.get(status, 0) + 1
+        self.latency.observe(latency_ms)
+
+    def observe_result(self, result: dict) -> None:
+        self.results[result["status"]] = self.results.get(result["status"], 0) + 1
+        self.solve_time.observe(result["time_ms"])
+
+    def to_dict(self) -> dict:
+        uptime = time.perf_counter() - self.start_time
+        n_results = sum(self.results.values())
+        return {
+            "uptime_s": round(uptime, 3),
+            "in_flight": self.in_flight,
+            "solves_total": n_results,
+            "solves_per_s": round(n_results / uptime, 3) if uptime else 0.0,
+            "responses": {str(status): n for status, n in self.responses.items()},
+            "results": self.results,
+            "latency_ms": self.latency.to_dict(),
+            "solve_time_ms": self.solve_time.to_dict(),
+        }
+
+
+def solve_request(
+    board: list[list[int]],
+    strategy: str,
+    strategy_param: str,
+    packed: bool,
+    timeout: float,
+    max_nodes: int,
+    max_memory_mb: float | None,
+) -> dict:
+    """Solve a board from a request within its budgets, see stream.solve_board. Runs in a worker process."""
+    state = State.from_rows(board)
+    if packed:
+        state = PackedState.from_array(state.array)
+    algorithm = create_algorithm(
+        strategy, strategy_param, max_nodes, max_memory_mb, timeout
+    )
+    # A search which doesn't stop itself at the timeout is interrupted with SIGALRM, so the worker is free again
+    return solve_board(algorithm, state, hard_time_limit(timeout))
+
+
+class SolveServer:
+    """
+    An HTTP server solving puzzles in a pool of worker processes, so that searches don't block the event loop
+    and many of them run in parallel.
+
+    POST /solve takes a JSON object: {"board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]], "strategy": "astr",
+    "param": "manh"} with optional "packed", "timeout" (seconds) and "max_nodes", which can only lower the server's
+    budgets. It answers with the result of stream.solve_board. GET /metrics answers with Metrics.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_memory_mb: float | None = None,
+    ):
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.max_memory_mb = max_memory_mb  # of a worker process
+        self.metrics = Metrics()
+        # Forked workers would inherit sockets of open connections and keep them open after the server closes them
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_logging,
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests of a connection until the client closes it or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()).strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = b""
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_SIZE:
+                    status, response = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                        "error": f"Body larger than {MAX_BODY_SIZE} bytes."
+                    }
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length)
+                    status, response = await self.handle(method, path, body)
+                    keep_alive = (
+                        headers.get("connection", "").lower() != "close"
+                        and version.strip() == "HTTP/1.1"
+                    )
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.error(f"Malformed request or broken connection: {e}")
+        finally:
+            writer.close()
+
+    async def handle(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, dict]:
+        """Route a request and return a tuple (<HTTP status>, <JSON response>)."""
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.metrics.to_dict()
+        if path != "/solve":
+            return HTTPStatus.NOT_FOUND, {"error": f"No such path: {path}."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST /solve."}
+
+        start_time = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            result = await self.solve(body)
+            status, response = HTTPStatus.OK, result
+            self.metrics.observe_result(result)
+        except RequestError as e:
+            status, response = e.status, {"error": str(e)}
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.observe_response(
+            status.value, (time.perf_counter() - start_time) * 1000.0
+        )
+        return status, response
+
+    async def solve(self, body: bytes) -> dict:
+        """
+        Validate a /solve request and solve it in a worker process.
+
+        :raise RequestError: If the request is invalid or the worker pool is broken.
+        """
+        try:
+            request = json.loads(body)
+            board = request["board"]
+            strategy, strategy_param = request["strategy"], request["param"]
+            packed = bool(request.get("packed", False))
+            timeout = min(float(request.get("timeout", self.timeout)), self.timeout)
+            max_nodes = min(
+                int(request.get("max_nodes", self.max_nodes)), self.max_nodes
+            )
+            # Invalid boards and strategies are rejected before taking a worker
+            state = State.from_rows(board)
+            if packed:
+                PackedState.from_array(state.array)
+            create_algorithm(strategy, strategy_param)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid request: {e!r}.")
+        except (
+            ValueError,
+            InvalidBoardException,
+            BoardTooLargeException,
+        ) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e) or repr(e))
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor,
+                solve_request,
+                board,
+                strategy,
+                strategy_param,
+                packed,
+                timeout,
+                max_nodes,
+                self.max_memory_mb,
+            )
+        except BrokenProcessPool as e:
+            logger.error(f"Worker pool is broken: {e}")
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, "Worker pool is broken.")
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.info(f"Serving on {host}:{port}.")
+        print(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str]) -> None:
+    # Example: python program.py serve --port 8080 --workers 8 --timeout 10
+    # curl -d '{"board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]], "strategy": "astr", "param": "manh"}' localhost:8080/solve
+    parser = argparse.ArgumentParser(prog="program.py serve")
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST}, local connections only)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Maximum time limit of a request in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=DEFAULT_MAX_NODES,
+        help=f"Maximum number of States expanded for a request (default: {DEFAULT_MAX_NODES})",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Stop a search when its worker process uses this much memory (MB)",
+    )
+    args = parser.parse_args(argv)
+
+    server = SolveServer(args.workers, args.timeout, args.max_nodes, args.max_memory_mb)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
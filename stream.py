@@ -0,0 +1,269 @@
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from loguru import logger
+
+from Exception import BoardTooLargeException, InvalidBoardException
+from algorithms.BaseAlgorithm import TIMEOUT, BaseAlgorithm
+from algorithms.CachedAlgorithm import CachedAlgorithm
+from batch import hard_time_limit, time_limit
+from memory.Board import is_solvable
+from memory.PackedState import PackedState
+from memory.SolutionCache import DEFAULT_MAX_ENTRIES, SolutionCache
+from memory.State import State
+from algorithms.ARAStar import ARAStar
+from program import ALGORITHMS, create_algorithm, get_anytime_solutions
+
+
+@dataclass
+class Puzzle:
+    """A puzzle read from a stream, or the reason why it couldn't be read."""
+
+    # "id" of a JSON record, otherwise a number of the puzzle in the stream
+    id: str | int
+    state: State | None
+    error: str | None = None
+
+
+def read_puzzles(lines: Iterable[str]) -> Iterator[Puzzle]:
+    """
+    Read puzzles from lines one by one, as soon as each of them is complete, so that a stream can be solved
+    while it's being written. Two formats can be mixed, blank lines between puzzles are skipped:
+
+    - puzzle file format (see State.load_state): a header with the size "<rows> <columns>" followed by the rows
+    - a JSON record in a single line: {"id": "a", "board": [[1, 2, 3], [4, 5, 6], [7, 8, 0]]} or just the board
+
+    A malformed puzzle is returned with an error instead of a State, reading goes on with the next one.
+    """
+    lines = iter(lines)
+    for number, line in enumerate((line for line in lines if line.strip()), start=1):
+        if line.lstrip().startswith(("{", "[")):
+            yield _read_json_puzzle(line, number)
+            continue
+        # Puzzle file format, the header tells how many rows follow
+        try:
+            n_rows = int(line.split()[0])
+            if n_rows < 1:
+                raise ValueError
+        except ValueError:
+            logger.error(f"Puzzle {number}: invalid header: {line.strip()}.")
+            yield Puzzle(number, None, f"Invalid header: {line.strip()}.")
+            continue
+        rows = []
+        for row in lines:
+            if row.strip():
+                rows.append(row)
+            if len(rows) == n_rows:
+                break
+        try:
+            yield Puzzle(number, State.from_lines([line, *rows], f"Puzzle {number}"))
+        except InvalidBoardException as e:
+            yield Puzzle(number, None, str(e))
+
+
+def _read_json_puzzle(line: str, number: int) -> Puzzle:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        logger.error(f"Puzzle {number}: invalid JSON: {e}.")
+        return Puzzle(number, None, f"Invalid JSON: {e}.")
+    if isinstance(record, dict):
+        puzzle_id, board = record.get("id", number), record.get("board")
+    else:
+        puzzle_id, board = number, record
+    if not isinstance(board, list) or not all(isinstance(row, list) for row in board):
+        logger.error(f"Puzzle {puzzle_id}: expected a board as a list of rows.")
+        return Puzzle(puzzle_id, None, "Expected a board as a list of rows.")
+    try:
+        return Puzzle(puzzle_id, State.from_rows(board))
+    except InvalidBoardException as e:
+        return Puzzle(puzzle_id, None, str(e))
+
+
+def solve_board(
+    algorithm: BaseAlgorithm, state: State, timeout: float | None = None
+) -> dict:
+    """
+    Solve a single board and return its result: status (solved, not_solved, unsolvable or the stop reason of
+    a search which exceeded a budget, see BaseAlgorithm), moves, their number (-1 without a solution), visited and
+    explored States, max depth and time in milliseconds. An anytime search (ARAStar) adds its improved solutions.
+
+    Unsolvable boards are rejected before running the algorithm, with zero stats.
+    A stopped search has the stats gathered until it was stopped.
+
+    :param timeout: time limit enforced with SIGALRM (see batch.hard_time_limit), for searches which don't stop
+                    themselves in time
+    """
+    if not is_solvable(
+        [int(tile) for tile in state.array.flat], state.get_state_shape()
+    ):
+        return {
+            "status": "unsolvable",
+            "moves": None,
+            "n_moves": -1,
+            "visited": 0,
+            "explored": 0,
+            "max_depth": 0,
+            "time_ms": 0.0,
+        }
+    start_time = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            moves = algorithm.solve(state)
+        if moves is not None:
+            status = "solved"
+        else:
+            status = algorithm.stop_reason or "not_solved"
+    except TimeoutError:
+        moves, status = None, TIMEOUT
+    time_in_ms = (time.perf_counter() - start_time) * 1000.0
+    result = {
+        "status": status,
+        "moves": moves,
+        "n_moves": len(moves) if moves is not None else -1,
+        "visited": algorithm.visited_states,
+        "explored": algorithm.explored_states,
+        "max_depth": algorithm.max_depth,
+        "time_ms": round(time_in_ms, 3),
+    }
+    solutions = get_anytime_solutions(algorithm)
+    if solutions is not None:
+        result["solutions"] = [asdict(solution) for solution in solutions]
+    return result
+
+
+def solve_stream(
+    strategy: str,
+    strategy_param: str,
+    input_: TextIO,
+    output: TextIO,
+    packed: bool = False,
+    cache: SolutionCache | None = None,
+    timeout: float | None = None,
+    max_nodes: int | None = None,
+    max_memory_mb: float | None = None,
+) -> int:
+    """
+    Solve puzzles read from input_ (see read_puzzles) and write a JSON line with the result of each one to output
+    as soon as it's solved. Return the number of puzzles.
+
+    An anytime search (ARAStar) also writes a line with status "improved" for each shorter solution as soon as
+    it's found, before the result of its puzzle.
+
+    The process stays warm between puzzles: heuristic tables, pattern databases and the cache connection are loaded
+    once. Only the algorithm is created for each puzzle, as it keeps the search state of a single puzzle.
+    """
+    n_puzzles = 0
+    for puzzle in read_puzzles(input_):
+        n_puzzles += 1
+        state = puzzle.state
+        if state is not None and packed:
+            try:
+                state = PackedState.from_array(state.array)
+            except BoardTooLargeException as e:
+                state, puzzle.error = None, str(e)
+        if state is None:
+            result = {"status": "invalid", "error": puzzle.error}
+        else:
+            algorithm = create_algorithm(
+                strategy, strategy_param, max_nodes, max_memory_mb, timeout
+            )
+            if isinstance(algorithm, ARAStar):
+                algorithm.on_solution = lambda solution, id_=puzzle.id: _write_line(
+                    {"id": id_, "status": "improved", **asdict(solution)}, output
+                )
+            if cache is not None:
+                algorithm = CachedAlgorithm(algorithm, strategy, strategy_param, cache)
+            result = solve_board(algorithm, state, hard_time_limit(timeout))
+            if cache is not None:
+                result["cache_hit"] = algorithm.cache_hit
+        _write_line({"id": puzzle.id, **result}, output)
+    return n_puzzles
+
+
+def _write_line(record: dict, output: TextIO) -> None:
+    output.write(json.dumps(record) + "\n")
+    output.flush()
+
+
+def main(argv: list[str]) -> None:
+    # Example: python generate.py | python program.py stream astr manh --cache cache.sqlite > results.jsonl
+    parser = argparse.ArgumentParser(
+        prog="program.py stream",
+        description="Solve puzzles read from STDIN and write a JSON line with each result to STDOUT.",
+    )
+    parser.add_argument(
+        "Strategy",
+        type=str,
+        choices=ALGORITHMS.keys(),
+        help="Algorithm, see program.py -h",
+    )
+    parser.add_argument(
+        "Strategy_param",
+        type=str,
+        help="Parameter of the algorithm with options, see program.py -h",
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Keep boards packed in a single integer (up to 4x4) instead of a numpy array",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Time limit for a single puzzle in seconds",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Maximum number of States expanded for a single puzzle",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Stop a search when the process uses this much memory (MB)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite file with cached solutions, see program.py --cache",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Maximum number of cached solutions (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    args = parser.parse_args(argv)
+
+    # Fail before reading any input if the strategy or its options are invalid
+    try:
+        create_algorithm(args.Strategy, args.Strategy_param)
+    except ValueError as e:
+        parser.error(str(e))
+    cache = SolutionCache(args.cache, args.cache_size) if args.cache else None
+    try:
+        n_puzzles = solve_stream(
+            args.Strategy,
+            args.Strategy_param,
+            sys.stdin,
+            sys.stdout,
+            args.packed,
+            cache,
+            args.timeout,
+            args.max_nodes,
+            args.max_memory_mb,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+    logger.info(f"Solved a stream of {n_puzzles} puzzles.")
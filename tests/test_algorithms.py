@@ -5,8 +5,16 @@ import numpy as np
 import pytest
 from loguru import logger
 
+from algorithms.BaseAlgorithm import MEMORY_LIMIT, NODE_LIMIT, TIMEOUT, BaseAlgorithm
 from algorithms.BFS import BFS
-from memory.State import State
+from algorithms.BidirectionalBFS import BidirectionalBFS
+from algorithms.DFS import DFS
+from algorithms.IDAStar import IDAStar
+from algorithms.IDDFS import IDDFS
+from algorithms.LayeredBFS import LayeredBFS
+from memory.PackedState import PackedState
+from memory.State import DIRECTIONS_STR_MAPPING, State
+from program import create_algorithm, parse_strategy_param
 
 logging.basicConfig(level=logging.DEBUG)
 logger.add(sys.stderr, format="{elapsed} {level} {function} {message}", level="DEBUG")
@@ -25,3 +33,207 @@ class TestAlgorithms:
     def test_bfs(self, some_state):
         bfs = BFS("UDLR")
         solution: str = bfs.solve(some_state)
+
+    @pytest.fixture
+    def shallow_state(self):
+        shallow_state: State = State(
+            array=np.array(
+                [[5, 1, 3, 4], [2, 6, 7, 8], [9, 10, 0, 12], [13, 14, 11, 15]]
+            )
+        )
+        yield shallow_state
+
+    @pytest.mark.parametrize("heuristic_type", ["hamm", "manh"])
+    def test_idastar(self, shallow_state, heuristic_type):
+        idastar = IDAStar(heuristic_type)
+        solution: str = idastar.solve(shallow_state)
+        assert solution == "LULURDDRDR"
+        assert idastar.max_depth == len(solution)
+        assert idastar.explored_states > 0
+
+    def test_idastar_packed(self, shallow_state):
+        assert IDAStar("manh").solve(
+            PackedState.from_array(shallow_state.array)
+        ) == IDAStar("manh").solve(shallow_state)
+
+    @pytest.mark.parametrize("query_order", ["LRUD", "DURL", "ULDR"])
+    def test_bidirectional_bfs(self, shallow_state, query_order):
+        bibfs = BidirectionalBFS(query_order)
+        solution: str = bibfs.solve(shallow_state)
+        assert len(solution) == 10
+
+        state = shallow_state
+        for move in solution:
+            state = state._move(DIRECTIONS_STR_MAPPING[move])
+        assert state.is_target_state()
+        assert bibfs.explored_states == len(bibfs.closed_list) + len(
+            bibfs.backward_closed_list
+        )
+
+    @pytest.mark.parametrize("query_order", ["LRUD", "DURL", "ULDR"])
+    def test_layered_bfs_matches_bfs(self, shallow_state, query_order):
+        bfs, layered_bfs = BFS(query_order), LayeredBFS(query_order)
+        assert layered_bfs.solve(shallow_state) == bfs.solve(shallow_state)
+        assert layered_bfs.visited_states == bfs.visited_states
+        assert layered_bfs.explored_states == bfs.explored_states
+        assert layered_bfs.max_depth == bfs.max_depth
+
+    def test_layered_bfs_packed(self, shallow_state):
+        assert LayeredBFS("LRUD").solve(
+            PackedState.from_array(shallow_state.array)
+        ) == LayeredBFS("LRUD").solve(shallow_state)
+
+
+def test_progress_events(mocker):
+    messages: list[str] = []
+    handler = logger.add(messages.append, level="INFO", format="{message}")
+    try:
+        mocker.patch.object(BFS, "progress_interval", 20)
+        trace_spy = mocker.spy(logger, "trace")
+        BFS("LRUD").solve(State(array=np.array([[4, 1, 2], [5, 0, 3], [7, 8, 6]])))
+    finally:
+        logger.remove(handler)
+    assert any(
+        message.startswith("Progress: 20 States expanded") for message in messages
+    )
+    trace_spy.assert_not_called()
+
+
+@pytest.fixture
+def state_3x3():
+    # The shortest solution has 6 moves: UURDDR
+    yield State(array=np.array([[4, 1, 3], [7, 2, 6], [0, 5, 8]]))
+
+
+@pytest.mark.parametrize("query_order", ["LRUD", "DRUL"])
+def test_dfs_depth_limit(state_3x3, query_order):
+    dfs = DFS(query_order, limit=12)
+    solution = dfs.solve(state_3x3)
+    assert solution is not None and len(solution) <= 12
+    assert dfs.max_depth <= 12
+    assert DFS(query_order, limit=5).solve(state_3x3) is None
+
+
+@pytest.mark.parametrize("state_type", [State, PackedState])
+def test_iddfs_shortest(state_3x3, state_type):
+    start = (
+        state_3x3 if state_type is State else PackedState.from_array(state_3x3.array)
+    )
+    iddfs = IDDFS("LRUD")
+    solution = iddfs.solve(start)
+    assert solution == "UURDDR"
+    assert iddfs.max_depth == 6
+    assert IDDFS("LRUD", limit=5).solve(start) is None
+
+
+def test_create_algorithm_options():
+    assert parse_strategy_param("LRUD:limit=30") == ("LRUD", {"limit": 30})
+    assert create_algorithm("dfs", "RDUL:limit=30").limit == 30
+    assert create_algorithm("dfs", "RDUL").limit == 20
+    with pytest.raises(ValueError):
+        create_algorithm("dfs", "RDUL:depth=30")
+    with pytest.raises(ValueError):
+        create_algorithm("dfs", "RDUL:limit")
+
+
+@pytest.fixture
+def state_31_moves():
+    yield State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))
+
+
+BUDGETED_STRATEGIES = [
+    ("bfs", "LRUD"),
+    ("bibfs", "LRUD"),
+    ("dfs", "LRUD:limit=30"),
+    ("iddfs", "LRUD"),
+    ("astr", "hamm"),
+    ("idastr", "hamm"),
+    ("smastr", "hamm"),
+]
+
+
+@pytest.mark.parametrize("strategy, param", BUDGETED_STRATEGIES)
+def test_node_budget(state_31_moves, strategy, param):
+    # More than 50 States have to be expanded by any of the algorithms
+    algorithm = create_algorithm(strategy, param, max_nodes=50)
+    assert algorithm.solve(state_31_moves) is None
+    assert algorithm.stop_reason == NODE_LIMIT
+    assert algorithm.explored_states == 50
+    assert algorithm.visited_states > 50
+
+
+@pytest.mark.parametrize("strategy, param", BUDGETED_STRATEGIES)
+def test_time_and_memory_budgets(mocker, state_31_moves, strategy, param):
+    mocker.patch.object(BaseAlgorithm, "budget_check_interval", 10)
+    algorithm = create_algorithm(strategy, param, timeout_s=0.0)
+    assert algorithm.solve(state_31_moves) is None
+    assert algorithm.stop_reason == TIMEOUT
+    assert 0 < algorithm.explored_states <= 10
+
+    algorithm = create_algorithm(strategy, param, max_memory_mb=1.0)
+    assert algorithm.solve(state_31_moves) is None
+    assert algorithm.stop_reason == MEMORY_LIMIT
+
+    algorithm = create_algorithm(strategy, param, timeout_s=60.0, max_memory_mb=1e6)
+    assert algorithm.solve(State(array=np.array([[1, 2, 3], [4, 5, 6], [7, 0, 8]])))
+    assert algorithm.stop_reason is None
+
+
+@pytest.mark.parametrize("nodes", [100_000, 200, 40])
+def test_smastr_shortest(state_31_moves, nodes):
+    smastr = create_algorithm("smastr", f"manh:nodes={nodes}")
+    solution = smastr.solve(state_31_moves)
+    assert len(solution) == 31
+    assert smastr.max_stored_states <= nodes + 3
+    if nodes < 1000:
+        assert smastr.forgotten_states > 0
+    state = state_31_moves
+    for move in solution:
+        state = state.get_neighbors(move)[0]
+    assert state.is_target_state()
+
+
+def test_smastr_memory_too_small(state_3x3):
+    # The path of 6 moves doesn't fit in 6 nodes with children of the States on it
+    assert create_algorithm("smastr", "manh:nodes=6").solve(state_3x3) is None
+    assert create_algorithm("smastr", "manh:nodes=9").solve(state_3x3) == "UURDDR"
+    with pytest.raises(ValueError):
+        create_algorithm("smastr", "manh:nodes=4")
+
+
+def test_weighted_astar(state_31_moves):
+    astar = create_algorithm("astr", "manh")
+    weighted = create_algorithm("astr", "manh:w=2.0")
+    assert len(astar.solve(state_31_moves)) == 31
+    # A solution of Weighted A* is at most w times longer than the shortest one
+    assert 31 <= len(weighted.solve(state_31_moves)) <= 62
+    assert weighted.explored_states < astar.explored_states
+    with pytest.raises(ValueError):
+        create_algorithm("astr", "manh:w=0.5")
+
+
+def test_arastar_improves_solutions(state_31_moves):
+    arastar = create_algorithm("arastr", "manh:w=5:step=1")
+    streamed = []
+    arastar.on_solution = streamed.append
+    assert len(arastar.solve(state_31_moves)) == 31
+    assert streamed == arastar.solutions
+    lengths = [solution.n_moves for solution in arastar.solutions]
+    assert lengths == sorted(set(lengths), reverse=True)
+    assert lengths[-1] == 31 and arastar.w == 1
+    with pytest.raises(ValueError):
+        create_algorithm("arastr", "manh:step=0")
+
+
+def test_arastar_budget_returns_best_solution(state_31_moves):
+    # The first solution of 45 moves is found after 280 expansions, the shortest one after 584
+    arastar = create_algorithm("arastr", "manh:w=5:step=1")
+    arastar.max_nodes = 400
+    solution = arastar.solve(state_31_moves)
+    assert arastar.stop_reason == NODE_LIMIT
+    assert len(solution) == arastar.solutions[-1].n_moves > 31
+    # Without any solution it stops like other algorithms
+    arastar = create_algorithm("arastr", "manh:w=5:step=1")
+    arastar.max_nodes = 10
+    assert arastar.solve(state_31_moves) is None
+    assert arastar.stop_reason == NODE_LIMIT
@@ -0,0 +1,104 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from batch import (
+    create_jobs,
+    find_puzzles,
+    parse_strategies,
+    run_job,
+    run_jobs,
+    write_summary,
+)
+
+
+@pytest.fixture
+def puzzles_directory(tmp_path: Path):
+    (tmp_path / "4x4_01_0001.txt").write_text(
+        "4 4\n1 2 3 4\n5 6 7 8\n9 10 11 12\n13 14 0 15\n"
+    )
+    (tmp_path / "4x4_02_0001.txt").write_text(
+        "4 4\n1 2 3 4\n5 6 7 8\n9 10 11 0\n13 14 15 12\n"
+    )
+    (tmp_path / "notes.md").write_text("not a puzzle")
+    yield tmp_path
+
+
+def test_parse_strategies():
+    assert parse_strategies(["astr:hamm,manh", "bfs:RDUL"]) == [
+        ("astr", "hamm"),
+        ("astr", "manh"),
+        ("bfs", "RDUL"),
+    ]
+    all_orders = parse_strategies(["dfs:*"])
+    assert len(all_orders) == 24
+    assert len(set(all_orders)) == 24
+    with pytest.raises(ValueError):
+        parse_strategies(["bogo:LRUD"])
+
+
+def test_find_puzzles(puzzles_directory: Path):
+    assert [path.name for path in find_puzzles([str(puzzles_directory)])] == [
+        "4x4_01_0001.txt",
+        "4x4_02_0001.txt",
+    ]
+    assert len(find_puzzles([str(puzzles_directory / "4x4_02_*.txt")])) == 1
+
+
+def test_run_job(puzzles_directory: Path):
+    [job] = create_jobs(
+        [puzzles_directory / "4x4_01_0001.txt"], [("bfs", "LRUD")], puzzles_directory
+    )
+    assert job.solution_file.endswith("4x4_01_0001_bfs_lrud_sol.txt")
+
+    row = run_job(job)
+    assert row["status"] == "solved"
+    assert row["n_moves"] == 1
+    assert Path(job.solution_file).read_text() == "1\nR"
+    assert Path(job.stats_file).read_text().splitlines()[:4] == ["1", "3", "1", "1"]
+
+
+def test_run_job_unsolvable(tmp_path: Path):
+    puzzle = tmp_path / "4x4_01_0002.txt"
+    puzzle.write_text("4 4\n1 2 3 4\n5 6 7 8\n9 10 11 12\n13 15 14 0\n")
+    [job] = create_jobs([puzzle], [("bfs", "LRUD")], tmp_path)
+
+    row = run_job(job)
+    assert row["status"] == "unsolvable"
+    assert Path(job.solution_file).read_text() == "-1"
+    assert Path(job.stats_file).read_text().splitlines()[:4] == ["-1", "0", "0", "0"]
+
+
+def test_run_job_node_budget(tmp_path: Path):
+    puzzle = tmp_path / "3x3_31_0001.txt"
+    puzzle.write_text("3 3\n8 6 7\n2 5 4\n3 0 1\n")
+    [job] = create_jobs([puzzle], [("bfs", "LRUD")], tmp_path, max_nodes=100)
+
+    row = run_job(job)
+    assert row["status"] == "node_limit"
+    assert row["explored"] == 100
+    assert Path(job.solution_file).read_text() == "-1"
+    # Stats gathered until the search was stopped
+    assert Path(job.stats_file).read_text().splitlines()[:3] == [
+        "-1",
+        str(row["visited"]),
+        "100",
+    ]
+
+
+def test_run_jobs_and_summary(puzzles_directory: Path):
+    jobs = create_jobs(
+        find_puzzles([str(puzzles_directory)]),
+        parse_strategies(["astr:manh", "idastr:hamm"]),
+        puzzles_directory,
+        packed=True,
+    )
+    rows = run_jobs(jobs, workers=2)
+    assert [row["status"] for row in rows] == ["solved"] * 4
+    assert [row["puzzle"] for row in rows] == [job.puzzle for job in jobs]
+
+    summary_path = puzzles_directory / "summary.csv"
+    write_summary(rows, summary_path)
+    with open(summary_path) as f:
+        assert len(list(csv.DictReader(f))) == 4
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from algorithms.BFS import BFS
+from benchmarks.compare import compare_runs
+from benchmarks.generator import generate_puzzles, write_puzzle
+from benchmarks.runner import load_results, run_benchmark, run_one, save_results
+from memory.State import State
+
+
+def test_generate_puzzles_reproducible():
+    puzzles = generate_puzzles((3, 3), [1, 2, 5], 2, seed=3)
+    assert [puzzle.name for puzzle in puzzles][:3] == [
+        "3x3_01_0001",
+        "3x3_01_0002",
+        "3x3_02_0001",
+    ]
+    assert puzzles == generate_puzzles((3, 3), [1, 2, 5], 2, seed=3)
+    for puzzle in puzzles:
+        solution = BFS("LRUD").solve(State(array=np.array(puzzle.tiles)))
+        assert len(solution) <= puzzle.depth
+
+
+def test_write_puzzle(tmp_path):
+    [puzzle] = generate_puzzles((2, 3), [4], 1, seed=0)
+    state = State.load_state(str(write_puzzle(puzzle, tmp_path)))
+    assert state.array.tolist() == puzzle.tiles
+
+
+def test_run_and_compare(tmp_path):
+    puzzles = generate_puzzles((3, 3), [2, 4], 1, seed=0)
+    runs = run_benchmark(puzzles, [("bfs", "LRUD"), ("astr", "manh")], workers=2)
+    assert [run.status for run in runs] == ["solved"] * 4
+    assert all(run.peak_rss_kb > 0 and run.nodes_per_s > 0 for run in runs)
+
+    path = tmp_path / "results.json"
+    save_results(runs, path, seed=0)
+    assert load_results(path) == runs
+    assert compare_runs(runs, runs) == []
+
+    slower = run_one(puzzles[1], "bfs", "LRUD")
+    slower.time_s = runs[2].time_s * 2 + 1
+    [difference] = compare_runs(runs, [slower])
+    assert difference.reason == "slower"
+    assert difference.ratio > 2
+
+    slower.visited += 1
+    [difference] = compare_runs(runs, [slower])
+    assert difference.reason == "results changed"
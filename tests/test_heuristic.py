@@ -0,0 +1,143 @@
+import random
+
+import numpy as np
+import pytest
+
+from algorithms.AStar import AStar
+from algorithms.Heuristic import (
+    Hamming,
+    LinearConflict,
+    Manhattan,
+    PatternDatabaseHeuristic,
+    WalkingDistance,
+    get_heuristic,
+)
+from memory.Board import get_goal
+from memory.PackedState import PackedState
+from memory.PatternDatabase import (
+    DEFAULT_PATTERNS,
+    UNVISITED,
+    generate_pattern_table,
+    get_pattern_path,
+    pattern_index,
+    save_pattern_table,
+)
+from memory.State import State
+
+
+@pytest.fixture
+def some_state():
+    yield State(
+        array=np.array([[5, 1, 3, 4], [2, 6, 7, 8], [9, 10, 0, 12], [13, 14, 11, 15]])
+    )
+
+
+def _random_walk(state, n_moves: int, seed: int = 7):
+    generator = random.Random(seed)
+    states = [state]
+    for _ in range(n_moves):
+        states.append(generator.choice(states[-1].get_neighbors()))
+    return states
+
+
+def test_get_goal():
+    goal = get_goal((4, 4))
+    assert goal.coords[1] == (0, 0)
+    assert goal.coords[5] == (1, 0)
+    assert goal.coords[15] == (3, 2)
+    assert goal.coords[0] == (3, 3)
+    assert goal.array[3, 3] == 0 and not goal.array.flags.writeable
+    assert get_goal((4, 4)) is goal
+
+
+def test_calculate(some_state):
+    assert Hamming().calculate(some_state) == 5
+    assert Manhattan().calculate(some_state) == 6
+    assert Manhattan().calculate(some_state.target_state) == 0
+
+
+@pytest.mark.parametrize("heuristic_type", ["hamm", "manh", "lc", "wd"])
+@pytest.mark.parametrize("state_type", [State, PackedState])
+def test_update_matches_calculate(some_state, heuristic_type, state_type):
+    heuristic = get_heuristic(heuristic_type)
+    start = (
+        some_state if state_type is State else PackedState.from_array(some_state.array)
+    )
+    for state in _random_walk(start, 30):
+        assert heuristic.evaluate(state) == heuristic.calculate(state)
+
+
+def test_linear_conflict():
+    # 2 and 1 are in their target row in reversed order, so one of them has to step out of the row and back
+    state = State(array=np.array([[2, 1, 3], [4, 5, 6], [7, 8, 0]]))
+    assert Manhattan().calculate(state) == 2
+    assert LinearConflict().calculate(state) == 4
+    assert LinearConflict()._line_conflicts([2, 1, 0]) == 2
+    assert LinearConflict()._line_conflicts([0, 2, 1, 3]) == 1
+
+
+def test_walking_distance():
+    state = State(array=np.array([[2, 1, 3], [4, 5, 6], [7, 8, 0]]))
+    assert WalkingDistance().calculate(state.target_state) == 0
+    assert WalkingDistance().calculate(state) >= Manhattan().calculate(state)
+    assert len(WalkingDistance._get_table(4, 4)) == 24964
+
+
+@pytest.mark.parametrize("heuristic_type", ["lc", "wd"])
+def test_astar_admissible(heuristic_type):
+    start = State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))  # 31 moves
+    assert len(AStar(heuristic_type).solve(start)) == 31
+
+
+@pytest.mark.parametrize("heuristic_type", ["lc", "wd"])
+def test_dominates_manhattan(some_state, heuristic_type):
+    heuristic = get_heuristic(heuristic_type)
+    for state in _random_walk(some_state, 40, seed=11):
+        assert heuristic.calculate(state) >= Manhattan().calculate(state)
+
+
+def test_unsupported_heuristic():
+    with pytest.raises(NotImplementedError):
+        get_heuristic("euclid")
+
+
+@pytest.fixture(scope="module")
+def pdb_directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("pdb")
+    for pattern in DEFAULT_PATTERNS[(3, 3)]:
+        save_pattern_table(
+            generate_pattern_table((3, 3), pattern),
+            get_pattern_path((3, 3), pattern, directory),
+        )
+    yield directory
+
+
+def test_pattern_table():
+    table = generate_pattern_table((3, 3), (1, 2))
+    assert len(table) == 9**2
+    assert table[pattern_index([0, 1], 9)] == 0  # both tiles in target positions
+    assert table[pattern_index([1, 0], 9)] > 2  # tiles swapped
+    assert table[pattern_index([0, 0], 9)] == UNVISITED
+
+
+def test_pattern_database_heuristic(pdb_directory):
+    heuristic = PatternDatabaseHeuristic(pdb_directory)
+    start = State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))  # 31 moves
+    assert heuristic.calculate(start.target_state) == 0
+    assert Manhattan().calculate(start) <= heuristic.calculate(start) <= 31
+    for state in _random_walk(start, 30):
+        assert heuristic.evaluate(state) == heuristic.calculate(state)
+
+
+def test_astar_pattern_database_optimal(pdb_directory):
+    start = State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))
+    astar = AStar("manh")
+    astar.heuristic = PatternDatabaseHeuristic(pdb_directory)
+    assert len(astar.solve(start)) == 31
+
+
+def test_pattern_database_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PatternDatabaseHeuristic(tmp_path).calculate(
+            State(array=np.array([[1, 2, 3], [4, 5, 6], [7, 0, 8]]))
+        )
@@ -0,0 +1,37 @@
+import numpy as np
+
+from algorithms.BFS import BFS
+from memory.NodeTable import NO_PARENT, NodeTable
+from memory.PackedState import PackedState
+from memory.State import State
+
+
+def test_add_and_follow_path():
+    nodes = NodeTable((3, 3))
+    start = PackedState.from_array(np.array([[1, 2, 3], [4, 5, 6], [7, 0, 8]]))
+    root = nodes.add(start)
+    left = start.left()
+    child = nodes.add(left, root)
+    grandchild = nodes.add(left.up(), child)
+
+    assert nodes.parents[root] == NO_PARENT
+    assert nodes.get_depth(root) == 0 and nodes.get_depth(grandchild) == 2
+    assert nodes.get_path(root) == "" and nodes.get_path(grandchild) == "LU"
+    assert nodes.get_state(grandchild) == left.up()
+    assert len(nodes) == 3 and nodes.nbytes == 3 * 22
+
+
+def test_deep_path_does_not_recurse():
+    state = State(array=np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]]))
+    for _ in range(2000):
+        state = state.left().right()
+    assert len(state.get_path_to_state()) == 4000
+    assert state.get_state_depth() == 4000
+
+
+def test_bfs_nodes():
+    start = State(array=np.array([[1, 2, 3], [4, 0, 6], [7, 5, 8]]))
+    bfs = BFS("LRUD")
+    assert bfs.solve(start) == "DR"
+    assert bfs.explored_states == 5
+    assert len(bfs.nodes) == len(bfs.seen)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from algorithms.AStar import AStar
+from algorithms.BFS import BFS
+from Exception import BoardTooLargeException
+from memory.PackedState import PackedState, pack_tiles, unpack_tiles
+from memory.State import State
+
+
+@pytest.fixture
+def some_array():
+    yield np.array([[1, 2, 3, 4], [5, 6, 0, 8], [9, 10, 7, 11], [13, 14, 15, 12]])
+
+
+def test_pack_unpack_tiles():
+    tiles = [2, 0, 3, 6, 1, 9, 7, 8, 14, 10, 15, 12, 5, 13, 11, 4]
+    board = pack_tiles(tiles)
+    assert board < 2**64
+    assert unpack_tiles(board, 16) == tiles
+
+
+def test_from_array(some_array):
+    state = PackedState.from_array(some_array)
+    assert state.blank == 6
+    assert state.get_state_shape() == (4, 4)
+    assert (state.array == some_array).all()
+    assert state.find_coords(7) == (2, 2)
+    assert state._find_zero() == (1, 2)
+
+
+def test_from_array_too_large():
+    with pytest.raises(BoardTooLargeException):
+        PackedState.from_array(np.arange(25).reshape((5, 5)))
+
+
+def test_get_neighbors_match_state(some_array):
+    packed_neighbors = PackedState.from_array(some_array).get_neighbors("RDUL")
+    array_neighbors = State(array=some_array).get_neighbors("RDUL")
+
+    assert len(packed_neighbors) == len(array_neighbors)
+    for packed, array in zip(packed_neighbors, array_neighbors):
+        assert (packed.array == array.array).all()
+        assert packed.preceding_operator == array.preceding_operator
+
+
+def test_is_target_state(some_array):
+    state = PackedState.from_array(some_array)
+    assert not state.is_target_state()
+    assert state.target_state.is_target_state()
+    assert state.target_state.blank == 15
+
+
+def test_hash_and_eq(some_array):
+    first = PackedState.from_array(some_array)
+    second = PackedState.from_array(some_array.copy())
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != first.left()
+
+
+@pytest.mark.parametrize("algorithm", [BFS("RDUL"), AStar("manh"), AStar("hamm")])
+def test_solve_packed(some_array, algorithm):
+    state = PackedState.from_array(some_array)
+    path = algorithm.solve(state)
+    assert path == "DRD"
+    assert state.get_state_depth() == 0
@@ -0,0 +1,45 @@
+import pytest
+
+from memory.PriorityQueue import MIN_STALE_ENTRIES, PriorityQueue
+
+
+def test_pop_lowest_priority_first_inserted_wins():
+    queue: PriorityQueue[str] = PriorityQueue()
+    queue.push(1, "a", 5)
+    queue.push(2, "b", 3)
+    queue.push(3, "c", 3)
+    queue.push(4, "d", 4)
+
+    assert [queue.pop() for _ in range(len(queue))] == [
+        (2, "b"),
+        (3, "c"),
+        (4, "d"),
+        (1, "a"),
+    ]
+    assert not queue
+
+
+def test_membership_and_lazy_deletion():
+    queue: PriorityQueue[str] = PriorityQueue()
+    queue.push(1, "a", 1)
+    queue.push(2, "b", 2)
+    queue.push(1, "a2", 3)  # re-pushed with a worse priority, old heap entry is stale
+
+    assert 1 in queue and 2 in queue and 3 not in queue
+    assert len(queue) == 2
+    assert queue.get(1) == "a2"
+
+    assert queue.remove(2) == "b"
+    assert 2 not in queue
+    assert queue.pop() == (1, "a2")
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_stale_entries_are_compacted():
+    queue: PriorityQueue[str] = PriorityQueue()
+    for i in range(10_000):
+        queue.push(i % 10, str(i), i)
+    assert len(queue) == 10
+    assert len(queue._heap) <= 2 * len(queue) + MIN_STALE_ENTRIES
+    assert [queue.pop()[1] for _ in range(10)] == [str(i) for i in range(9990, 10_000)]
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from algorithms.Profiler import PHASE_METHODS, Profiler
+from memory.PackedState import PackedState
+from memory.State import State
+from program import create_algorithm
+
+
+@pytest.fixture
+def state_3x3():
+    yield State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))
+
+
+def test_phases_are_counted(state_3x3):
+    originals = {
+        (cls, name): cls.__dict__[name]
+        for methods in PHASE_METHODS.values()
+        for cls, name in methods
+    }
+    astar = create_algorithm("astr", "manh")
+    profiler = Profiler()
+    with profiler.profile(astar):
+        assert len(astar.solve(state_3x3)) == 31
+
+    # The initial State and every generated one are checked if they're the target
+    assert profiler.calls["goal_checks"] == astar.visited_states
+    assert profiler.calls["neighbors"] == astar.explored_states
+    assert all(profiler.calls[phase] > 0 for phase in PHASE_METHODS)
+    assert sum(profiler.times.values()) <= profiler.total_time
+    # Original methods are restored, so searches which aren't profiled pay nothing
+    for (cls, name), method in originals.items():
+        assert cls.__dict__[name] is method
+    unprofiled = create_algorithm("astr", "manh")
+    unprofiled.solve(state_3x3)
+    assert profiler.calls["goal_checks"] == astar.visited_states
+    assert type(unprofiled.closed_list) is dict
+
+
+@pytest.mark.parametrize("tool", [None, "cprofile", "tracemalloc"])
+def test_write_report(tmp_path: Path, tool):
+    bfs = create_algorithm("bfs", "LRUD")
+    profiler = Profiler(tool)
+    with profiler.profile(bfs):
+        bfs.solve(PackedState.from_array(np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]])))
+    report_path = profiler.write_report(tmp_path / "x_stats.txt", strategy="bfs")
+
+    assert report_path == tmp_path / "x_stats.profile.json"
+    report = json.loads(report_path.read_text())
+    assert report["strategy"] == "bfs"
+    assert report["phases"]["duplicate_checks"]["calls"] > 0
+    assert ("cprofile" in report) == (tool == "cprofile")
+    assert (tmp_path / "x_stats.prof").exists() == (tool == "cprofile")
+    if tool == "tracemalloc":
+        assert report["tracemalloc"]["peak_mb"] > 0 and report["tracemalloc"]["top"]
+
+
+def test_unsupported_tool():
+    with pytest.raises(ValueError):
+        Profiler("perf")
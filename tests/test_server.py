@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from server import Histogram, SolveServer
+
+
+@pytest.fixture
+def server():
+    server = SolveServer(workers=1, timeout=5.0, max_nodes=1000)
+    yield server
+    server.close()
+
+
+async def _request(port: int, method: str, path: str, body: dict | None = None):
+    """Send a single HTTP request to a local server and return (<status>, <JSON response>)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + payload
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+def test_histogram():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.to_dict() == {
+        "le": {"1": 2, "10": 3, "+Inf": 4},
+        "count": 4,
+        "sum": 56.5,
+    }
+
+
+def test_server(server: SolveServer):
+    async def run():
+        tcp_server = await asyncio.start_server(
+            server.handle_connection, "127.0.0.1", 0
+        )
+        port = tcp_server.sockets[0].getsockname()[1]
+        async with tcp_server:
+            solved = await _request(
+                port,
+                "POST",
+                "/solve",
+                {
+                    "board": [[1, 2, 3], [4, 5, 6], [0, 7, 8]],
+                    "strategy": "bfs",
+                    "param": "LRUD",
+                },
+            )
+            # The request can't raise the server's budget of 1000 nodes
+            stopped = await _request(
+                port,
+                "POST",
+                "/solve",
+                {
+                    "board": [[8, 6, 7], [2, 5, 4], [3, 0, 1]],
+                    "strategy": "astr",
+                    "param": "hamm",
+                    "max_nodes": 10**9,
+                },
+            )
+            invalid = await _request(
+                port,
+                "POST",
+                "/solve",
+                {"board": [[1, 1], [2, 0]], "strategy": "bfs", "param": "LRUD"},
+            )
+            not_found = await _request(port, "GET", "/solve")
+            metrics = await _request(port, "GET", "/metrics")
+        return solved, stopped, invalid, not_found, metrics
+
+    solved, stopped, invalid, not_found, metrics = asyncio.run(run())
+    assert solved[0] == 200 and solved[1]["moves"] == "RR"
+    assert stopped[0] == 200 and stopped[1]["status"] == "node_limit"
+    assert stopped[1]["explored"] == 1000
+    assert invalid[0] == 400 and "duplicated" in invalid[1]["error"]
+    assert not_found[0] == 405
+    assert metrics[0] == 200
+    assert metrics[1]["results"] == {"solved": 1, "node_limit": 1}
+    assert metrics[1]["responses"] == {"200": 2, "400": 1}
+    assert metrics[1]["latency_ms"]["count"] == 3
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from algorithms.BFS import BFS
+from algorithms.CachedAlgorithm import CachedAlgorithm
+from memory.SolutionCache import CachedSolution, SolutionCache, board_key
+from memory.State import State
+from program import solve_puzzle
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolutionCache(tmp_path / "cache.sqlite", max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_board_key():
+    assert board_key(np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]])) == "3x3:087654321"
+    assert board_key(np.arange(20).reshape(4, 5)).startswith("4x5:0-1-2-")
+
+
+def test_get_put_and_lru_eviction(cache):
+    solution = CachedSolution(moves="LU", visited=10, explored=4, max_depth=2)
+    cache.put("a", "bfs", "LRUD", solution)
+    cache.put("b", "bfs", "LRUD", CachedSolution(None, 5, 5, 20))
+    assert (
+        cache.get("a", "bfs", "LRUD") == solution
+    )  # "a" is now used more recently than "b"
+    assert cache.get("a", "bfs", "RDUL") is None
+
+    cache.put("c", "bfs", "LRUD", solution)
+    assert len(cache) == 2
+    assert cache.get("b", "bfs", "LRUD") is None
+    assert cache.get("a", "bfs", "LRUD") is not None
+
+
+def test_cache_hit_skips_search(cache, tmp_path, mocker: MockerFixture):
+    puzzle = tmp_path / "puzzle.txt"
+    puzzle.write_text("3 3\n1 2 3\n4 5 6\n0 7 8\n")
+    stats = []
+    for _ in range(2):
+        algorithm = CachedAlgorithm(BFS("LRUD"), "bfs", "LRUD", cache)
+        with open(tmp_path / "sol.txt", "w") as solution_file, open(
+            tmp_path / "stats.txt", "w"
+        ) as stats_file:
+            solve_spy = mocker.spy(algorithm.algorithm, "solve")
+            moves, _ = solve_puzzle(algorithm, puzzle, solution_file, stats_file)
+        assert moves == "RR"
+        assert (tmp_path / "sol.txt").read_text() == "2\nRR"
+        stats.append((tmp_path / "stats.txt").read_text().splitlines())
+
+    solve_spy.assert_not_called()
+    assert stats[0][:4] == stats[1][:4]
+    assert stats[0][5] == "0" and stats[1][5] == "1"
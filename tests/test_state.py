@@ -8,6 +8,8 @@ import pytest
 from loguru import logger
 from pytest_mock import MockerFixture
 
+from Exception import InvalidBoardException
+from memory.Board import is_solvable
 from memory.State import DIRECTION, State
 
 logging.basicConfig(level=logging.DEBUG)
@@ -435,3 +437,68 @@ def test_find_coords(some_state):
     assert some_state.find_coords(22) is None
     assert some_state.find_coords(5) == (1, 0)
     assert some_state.find_coords(10) == (3, 3)
+
+
+def test_blank_tracked_in_children(state_bottom_left_corner: State):
+    assert state_bottom_left_corner.blank == (3, 0)
+    for neighbor in state_bottom_left_corner.get_neighbors("LRUD"):
+        assert neighbor.blank == tuple(int(x[0]) for x in np.where(neighbor.array == 0))
+
+
+def test_get_neighbors_skips_illegal_moves(
+    state_bottom_left_corner: State, mocker: MockerFixture
+):
+    move_spy = mocker.spy(State, "_move")
+    state_bottom_left_corner.get_neighbors("LRUD")
+    assert [call.args[1] for call in move_spy.call_args_list] == ["right", "up"]
+
+
+def test_depth_stored_in_children(state_bottom_left_corner: State):
+    assert state_bottom_left_corner.depth == 0
+    child = state_bottom_left_corner.right()
+    grandchild = child.up()
+    assert child.get_state_depth() == 1
+    assert grandchild.get_state_depth() == 2
+    assert copy.deepcopy(grandchild).depth == 2
+
+
+@pytest.mark.parametrize(
+    "tiles, shape, solvable",
+    [
+        ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0], (4, 4), True),
+        ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 15, 14, 0], (4, 4), False),
+        ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 13, 14, 15, 12], (4, 4), True),
+        ([8, 6, 7, 2, 5, 4, 3, 0, 1], (3, 3), True),
+        ([2, 1, 3, 4, 5, 6, 7, 8, 0], (3, 3), False),
+        ([1, 2, 3, 4, 5, 6, 0, 7], (2, 4), True),
+        ([1, 2, 3, 4, 5, 7, 6, 0], (2, 4), False),
+    ],
+)
+def test_is_solvable(tiles: list[int], shape: tuple[int, int], solvable: bool):
+    assert is_solvable(tiles, shape) == solvable
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "4 4\n1 2 3 4\n5 6 7 8\n9 10 11 12\n",  # missing row
+        "3 3\n1 2 3\n4 5 6\n7 8\n",  # short row
+        "3 3\n1 2 3\n4 5 6\n7 7 0\n",  # duplicated tile
+        "3 3\n1 2 3\n4 5 6\n7 9 0\n",  # out of range tile
+        "3 3\n1 2 3\n4 x 6\n7 8 0\n",
+        "",
+    ],
+)
+def test_load_state_invalid(tmp_path, content: str):
+    path = tmp_path / "puzzle.txt"
+    path.write_text(content)
+    with pytest.raises(InvalidBoardException):
+        State.load_state(str(path))
+
+
+def test_load_state_valid(tmp_path):
+    path = tmp_path / "puzzle.txt"
+    path.write_text("2 3\n1 2 3\n4 0 5\n")
+    state = State.load_state(str(path))
+    assert state.get_state_shape() == (2, 3)
+    assert state.blank == (1, 1)
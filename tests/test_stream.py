@@ -0,0 +1,90 @@
+import io
+import json
+from pathlib import Path
+
+from memory.SolutionCache import SolutionCache
+from stream import read_puzzles, solve_stream
+
+STREAM = (
+    "4 4\n1 2 3 4\n5 6 7 8\n9 10 11 12\n13 14 0 15\n"
+    "\n"
+    '{"id": "json", "board": [[1, 2, 3], [4, 5, 6], [0, 7, 8]]}\n'
+    "[[1, 2, 3], [4, 5, 6], [8, 7, 0]]\n"
+    "[[1, 2], [3, 3]]\n"
+    "2 2\n1 2\n3 x\n"
+    "3 3\n1 2 3\n4 5 6\n7 0 8\n"
+)
+
+
+def test_read_puzzles():
+    puzzles = list(read_puzzles(io.StringIO(STREAM)))
+    assert [puzzle.id for puzzle in puzzles] == [1, "json", 3, 4, 5, 6]
+    assert puzzles[0].state.get_state_shape() == (4, 4)
+    assert puzzles[1].state.array.tolist() == [[1, 2, 3], [4, 5, 6], [0, 7, 8]]
+    assert puzzles[3].state is None and "duplicated: [3]" in puzzles[3].error
+    assert puzzles[4].state is None and puzzles[4].error
+    assert puzzles[5].state.array.tolist() == [[1, 2, 3], [4, 5, 6], [7, 0, 8]]
+
+
+def test_read_puzzles_is_lazy():
+    """A puzzle is read as soon as its last row arrives, without waiting for the rest of a stream."""
+
+    def lines():
+        yield "2 2\n"
+        yield "1 2\n"
+        yield "3 0\n"
+        raise AssertionError("Read past the first puzzle.")
+
+    assert next(read_puzzles(lines())).state.array.tolist() == [[1, 2], [3, 0]]
+
+
+def test_solve_stream():
+    output = io.StringIO()
+    assert solve_stream("bfs", "LRUD", io.StringIO(STREAM), output, packed=True) == 6
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result["status"] for result in results] == [
+        "solved",
+        "solved",
+        "unsolvable",
+        "invalid",
+        "invalid",
+        "solved",
+    ]
+    assert results[0] == {
+        "id": 1,
+        "status": "solved",
+        "moves": "R",
+        "n_moves": 1,
+        "visited": 3,
+        "explored": 1,
+        "max_depth": 1,
+        "time_ms": results[0]["time_ms"],
+    }
+    assert results[1]["moves"] == "RR"
+    assert results[2]["n_moves"] == -1 and results[2]["visited"] == 0
+
+
+def test_solve_stream_with_cache(tmp_path: Path):
+    cache = SolutionCache(tmp_path / "cache.sqlite")
+    stream = "[[1, 2, 3], [4, 5, 6], [0, 7, 8]]\n" * 2
+    output = io.StringIO()
+    solve_stream("astr", "manh", io.StringIO(stream), output, cache=cache)
+    cache.close()
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result["cache_hit"] for result in results] == [False, True]
+    assert results[0]["moves"] == results[1]["moves"] == "RR"
+
+
+def test_solve_stream_anytime():
+    """Improved solutions of an anytime search are written as soon as they're found, before the result."""
+    output = io.StringIO()
+    stream = "[[1, 2, 3], [4, 5, 6], [0, 7, 8]]\n"
+    solve_stream("arastr", "manh:w=2", io.StringIO(stream), output)
+    *improved, result = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line["status"] for line in improved] == ["improved"]
+    assert improved[0]["id"] == result["id"] == 1 and improved[0]["n_moves"] == 2
+    assert result["status"] == "solved"
+    assert result["solutions"] == [
+        {key: value for key, value in line.items() if key not in ("id", "status")}
+        for line in improved
+    ]
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from algorithms.AStar import AStar
+from algorithms.BFS import BFS
+from algorithms.CachedAlgorithm import CachedAlgorithm
+from algorithms.Heuristic import Manhattan, PatternDatabaseHeuristic
+from memory.Board import get_goal
+from memory.PatternDatabase import (
+    DEFAULT_PATTERNS,
+    generate_pattern_table,
+    get_pattern_path,
+    save_pattern_table,
+)
+from memory.SolutionCache import SolutionCache
+from memory.State import DIRECTIONS_STR_MAPPING, State
+from memory.Symmetry import (
+    canonicalize,
+    transpose_board,
+    transpose_moves,
+    transpose_param,
+    transpose_positions,
+)
+
+
+@pytest.fixture
+def some_state():
+    yield State(array=np.array([[4, 1, 3], [7, 2, 6], [0, 5, 8]]))
+
+
+def _apply(state: State, moves: str) -> State:
+    for move in moves:
+        state = state._move(DIRECTIONS_STR_MAPPING[move])
+    return state
+
+
+def test_transpose_board(some_state):
+    goal = get_goal((3, 3)).array
+    assert (transpose_board(goal) == goal).all()
+    transposed = transpose_board(some_state.array)
+    assert (transpose_board(transposed) == some_state.array).all()
+
+    solution = BFS("LRUD").solve(some_state)
+    assert _apply(State(array=transposed), transpose_moves(solution)).is_target_state()
+
+
+def test_transpose_positions(some_state):
+    positions = PatternDatabaseHeuristic._get_positions(some_state)
+    transposed = State(array=transpose_board(some_state.array))
+    assert transpose_positions(positions, 3) == PatternDatabaseHeuristic._get_positions(
+        transposed
+    )
+
+
+def test_canonicalize(some_state):
+    canonical, transposed = canonicalize(some_state.array)
+    mirrored, mirrored_transposed = canonicalize(transpose_board(some_state.array))
+    assert (canonical == mirrored).all()
+    assert transposed != mirrored_transposed
+    assert canonicalize(np.arange(6).reshape(2, 3))[1] is False
+
+
+def test_transpose_param():
+    assert transpose_param("LRUD") == "UDLR"
+    assert transpose_param("RDUL:limit=30") == "DRLU:limit=30"
+    assert transpose_param("manh") is None
+
+
+@pytest.mark.parametrize("strategy, param", [("bfs", "RDLU"), ("astr", "manh")])
+def test_cache_shared_by_transposed_boards(tmp_path, some_state, strategy, param):
+    cache = SolutionCache(tmp_path / "cache.sqlite")
+    algorithm_type = BFS if strategy == "bfs" else AStar
+    first = CachedAlgorithm(algorithm_type(param), strategy, param, cache)
+    first.solve(some_state)
+    assert len(cache) == 1
+
+    # BFS with the transposed query order on the transposed board is exactly the same search
+    transposed_param = transpose_param(param) or param
+    transposed = State(array=transpose_board(some_state.array))
+    second = CachedAlgorithm(
+        algorithm_type(transposed_param), strategy, transposed_param, cache
+    )
+    moves = second.solve(transposed)
+    assert second.cache_hit
+    assert _apply(transposed, moves).is_target_state()
+    if strategy == "bfs":
+        assert moves == algorithm_type(transposed_param).solve(transposed)
+    cache.close()
+
+
+def test_symmetric_pattern_database(tmp_path):
+    for pattern in DEFAULT_PATTERNS[(3, 3)]:
+        save_pattern_table(
+            generate_pattern_table((3, 3), pattern),
+            get_pattern_path((3, 3), pattern, tmp_path),
+        )
+    symmetric = PatternDatabaseHeuristic(tmp_path)
+    plain = PatternDatabaseHeuristic(tmp_path, symmetric=False)
+    start = State(array=np.array([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))  # 31 moves
+    assert Manhattan().calculate(start) <= plain.calculate(start)
+    assert plain.calculate(start) <= symmetric.calculate(start) <= 31
+
+    astar = AStar("manh")
+    astar.heuristic = symmetric
+    assert len(astar.solve(start)) == 31